@@ -12,18 +12,45 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", ""),
     "database": os.getenv("DB_NAME", "nba_raw")
 }
+DB_POOL_SIZE = 8      # Connections kept open in the shared pool
 
 # API Settings
 API_RATE_LIMIT = 3    # seconds between calls (increased from lower value)
+API_BURST = 3         # calls allowed back-to-back before rate limiting kicks in
+API_WORKERS = 4       # concurrent API calls for per-player loaders
 API_TIMEOUT = 90      # request timeout in seconds
 API_MAX_RETRIES = 5   # number of retry attempts
 COOLDOWN_INTERVAL = 20  # Take a break after every N players
 COOLDOWN_TIME = 15    # How long to wait during cool-down (seconds)
+HTTP_CACHE_NAME = "nba_api_cache"  # On-disk response cache (--cache-http)
+HTTP_CACHE_EXPIRE = 86400 * 7      # Cached responses expire after (seconds)
+HTTP_CACHE_URL_EXPIRE = {          # Shorter TTLs for data that can change daily
+    "stats.nba.com/stats/playercareerstats": 43200,
+    "stats.nba.com/stats/commonplayerinfo": 43200,
+}
 
 # Data Loading Settings
 START_SEASON = 2023   # Default start season
 END_SEASON = 2025     # Default end season
-BATCH_SIZE = 500      # Rows per batch insert
+
+
+def format_season(year: int) -> str:
+    """Format a season start year the way the API expects, e.g. 2023 -> '2023-24'."""
+    return f"{year}-{str(year + 1)[-2:]}"
+
+
+BATCH_SIZE = 500      # Minimum rows per batch insert (grown to fit max_allowed_packet)
+MAX_BATCH_SIZE = 20000  # Upper bound on rows per multi-row insert
+BULK_INSERT_BUFFER_SIZE = 256 * 1024 * 1024  # Session bulk_insert_buffer_size (bytes)
+FALLBACK_BATCH_SIZE = 64  # Rows per insert when a full batch is rejected
+BULK_LOAD_THRESHOLD = 10000  # Use LOAD DATA LOCAL INFILE at or above this many rows
+FLUSH_THRESHOLD = 50000  # Insert buffered fetch results once this many rows are held
+MAX_PENDING_FLUSHES = 2  # Flushed frames allowed to wait for the insert thread
+READ_CHUNK_SIZE = 10000  # Rows per fetchmany() when streaming existing rows from MySQL
+EMPTY_CAREER_RECHECK_DAYS = 90  # Resume runs skip players with no career stats checked within N days
+TEAM_LOG_CACHE_DIR = ".cache/team_game_logs"  # Parquet copies of finished team-seasons (None disables)
 
 # Logging
-VERBOSE = True        # Print detailed logs
\ No newline at end of file
+VERBOSE = True        # Print detailed logs
+LOG_EVERY_BATCHES = 50  # Print insert progress once per N batches
+PROGRESS_INTERVAL = 0.5  # Seconds between fetch progress lines
\ No newline at end of file
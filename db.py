@@ -1,13 +1,72 @@
 """Database connection and utilities."""
 import mysql.connector
+from mysql.connector import pooling
 from contextlib import contextmanager
-from config import DB_CONFIG, VERBOSE
+from threading import Lock
+from config import DB_CONFIG, DB_POOL_SIZE, VERBOSE, BULK_INSERT_BUFFER_SIZE
+
+_pool = None
+_pool_lock = Lock()
+
+
+def _get_pool():
+    """
+    Return the shared connection pool, creating it on first use.
+
+    Created lazily so importing this module never connects, and so
+    create_database() can run before the target database exists.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # C extension for speed; local infile for LOAD DATA bulk loads
+            _pool = pooling.MySQLConnectionPool(
+                pool_name="nba",
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=False,
+                allow_local_infile=True,
+                use_pure=False,
+                **DB_CONFIG
+            )
+        return _pool
+
+
+def _configure_session(conn):
+    """
+    Tune a new session for bulk inserts and cache its packet limit.
+
+    Sets conn.max_allowed_packet so loaders can size multi-row inserts
+    without querying the server again. Pooled sessions are reused, so this
+    runs once per underlying connection.
+
+    Args:
+        conn: Open MySQL connection (pooled or plain)
+    """
+    # Pooled wrappers forward attribute reads to the real connection
+    conn = getattr(conn, '_cnx', conn)
+    if getattr(conn, 'max_allowed_packet', None) is not None:
+        return
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SHOW VARIABLES LIKE 'max_allowed_packet'")
+        row = cursor.fetchone()
+        conn.max_allowed_packet = int(row[1]) if row else None
+        cursor.execute(f"SET SESSION bulk_insert_buffer_size = {int(BULK_INSERT_BUFFER_SIZE)}")
+    except Exception as e:
+        conn.max_allowed_packet = getattr(conn, 'max_allowed_packet', None)
+        if VERBOSE:
+            print(f"⚠️  Could not tune session for bulk inserts: {e}")
+    finally:
+        cursor.close()
 
 @contextmanager
 def get_db():
     """
     Context manager for database connections.
     Automatically commits on success, rolls back on error.
+    Connections come from a shared pool; closing returns them to it.
     
     Usage:
         with get_db() as conn:
@@ -16,7 +75,8 @@ def get_db():
     """
     conn = None
     try:
-        conn = mysql.connector.connect(**DB_CONFIG)
+        conn = _get_pool().get_connection()
+        _configure_session(conn)
         yield conn
         conn.commit()
     except Exception as e:
@@ -1,10 +1,16 @@
 """Loaders package for NBA data."""
-from loaders.teams import load_teams
-from loaders.players import load_players
-from loaders.game_logs import load_game_logs
-from loaders.team_game_logs import load_team_game_logs
-from loaders.player_info import load_player_info
-from loaders.player_career import load_player_career
+import importlib
+
+# Loader entry points are resolved on first access (PEP 562) so importing
+# the package doesn't pull in polars/nba_api until a loader actually runs
+_LAZY = {
+    'load_teams': 'loaders.teams',
+    'load_players': 'loaders.players',
+    'load_game_logs': 'loaders.game_logs',
+    'load_team_game_logs': 'loaders.team_game_logs',
+    'load_player_info': 'loaders.player_info',
+    'load_player_career': 'loaders.player_career',
+}
 
 __all__ = [
     'load_teams',
@@ -14,3 +20,15 @@ __all__ = [
     'load_player_info',
     'load_player_career'
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,13 +1,89 @@
 """Base loader class with common functionality."""
+import os
+import re
 import time
 import random
+import tempfile
 import signal
 import sys
-import math
+from itertools import chain
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import ExitStack, contextmanager
+import threading
+from threading import Event, Lock
 import polars as pl
 from db import get_db
-from config import API_RATE_LIMIT, API_MAX_RETRIES, API_TIMEOUT, BATCH_SIZE, VERBOSE
+from loaders.rate_limiter import TokenBucket
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP
+from loaders.http_session import install_session, reset_session
+from config import (
+    API_RATE_LIMIT, API_BURST, API_MAX_RETRIES, API_TIMEOUT, BATCH_SIZE, MAX_BATCH_SIZE,
+    FALLBACK_BATCH_SIZE, BULK_LOAD_THRESHOLD, COOLDOWN_TIME, VERBOSE, LOG_EVERY_BATCHES,
+    API_WORKERS, FLUSH_THRESHOLD, MAX_PENDING_FLUSHES
+)
+
+
+MAX_PLACEHOLDERS = 65535  # Parameter limit of a server-side prepared statement
+# RAM-backed tmpfs where available, so LOAD DATA's CSV never touches disk
+INFILE_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+# Secondary index lines in get_create_table_sql(): "[UNIQUE] INDEX|KEY name (cols)"
+_INDEX_DEF = re.compile(r"^\s*(UNIQUE\s+)?(?:INDEX|KEY)\s+(\w+)\s*\(.*\)", re.IGNORECASE | re.MULTILINE)
+
+# Shutdown state is process-wide so every loader (and worker thread) sees it
+_shutdown_event = Event()  # Set once SIGINT/SIGTERM is received
+_cleanup_event = Event()  # Set while partial data is being saved
+_first_interrupt = False
+_handlers_installed = False
+
+
+def _signal_handler(signum, frame):
+    """
+    Handle shutdown signals gracefully.
+
+    Args:
+        signum: Signal number
+        frame: Current stack frame
+    """
+    global _first_interrupt
+
+    signal_name = 'SIGINT' if signum == signal.SIGINT else 'SIGTERM'
+    
+    # If already cleaning up, force exit
+    if _cleanup_event.is_set():
+        print("\n❌ Force shutdown during cleanup - some data may be lost")
+        sys.exit(1)
+    
+    print(f"\n⚠️  Received {signal_name} - initiating graceful shutdown...")
+    print("   Completing current operation, please wait...")
+    print("   (Press Ctrl+C again to force quit - may lose partial data)")
+
+    _shutdown_event.set()
+
+    # If interrupted twice before cleanup, force exit
+    if _first_interrupt:
+        print("\n❌ Force shutdown requested - exiting immediately")
+        sys.exit(1)
+
+    _first_interrupt = True
+
+
+def _install_signal_handlers():
+    """
+    Set up signal handlers for graceful shutdown, once per process.
+
+    signal.signal only works on the main thread, so this is a no-op when
+    called from anywhere else; loaders can then be built on worker threads.
+    """
+    global _handlers_installed
+
+    if _handlers_installed or threading.current_thread() is not threading.main_thread():
+        return
+
+    signal.signal(signal.SIGINT, _signal_handler)
+    signal.signal(signal.SIGTERM, _signal_handler)
+    _handlers_installed = True
 
 
 class BaseLoader(ABC):
@@ -18,54 +94,50 @@ class BaseLoader(ABC):
     - fetch_data(): Fetch data from NBA API
     - get_create_table_sql(): Return CREATE TABLE statement
     - Set self.table_name
+    - Set self.pk_columns (primary key) so inserts can upsert in place
     """
 
     def __init__(self):
         self.table_name = None  # Must be set in subclass
-        self._shutdown_requested = False
-        self._partial_data = []  # Store partial results during fetch
-        self._is_cleaning_up = False  # Flag to allow insert during cleanup
-        self._setup_signal_handlers()
+        self.pk_columns = ()  # Primary key columns, excluded from the UPDATE list
+        self.use_replace = False  # Opt in to REPLACE INTO (delete + insert) semantics
+        self.cache_http = False  # Serve repeat API requests from the on-disk cache
+        self._partial_columns = {}  # Column name -> Series collected during fetch
+        self._partial_rows = 0  # Rows held in _partial_columns
+        self._partial_lock = Lock()  # Fetch workers may append concurrently
+        self._flush_executor = None  # Single background thread that inserts flushed rows
+        self._pending_flushes = []  # Futures of flush inserts not yet waited on
+        self._canonical_schema = None  # Column -> dtype fixed by the first buffered frame
+        self._flushed_rows = 0  # Rows already inserted by _flush_partial
+        self._bulk_session = None  # ExitStack holding _bulk_insert_session once started
+        self._conn = None  # Connection shared across run() steps
+        self._prepared = None  # (connection_id, prepared cursor) on the shared connection
+        self._sql_cache = {}  # (table, columns, n_rows) -> insert SQL
+        self._rate_limiter = TokenBucket(rate=1 / API_RATE_LIMIT, burst=API_BURST)
 
-    def _setup_signal_handlers(self):
-        """Set up signal handlers for graceful shutdown."""
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+    @property
+    def _shutdown_requested(self) -> bool:
+        """Whether a shutdown signal has been received (shared by all loaders)."""
+        return _shutdown_event.is_set()
 
-    def _signal_handler(self, signum, frame):
-        """
-        Handle shutdown signals gracefully.
-
-        Args:
-            signum: Signal number
-            frame: Current stack frame
-        """
-        signal_name = 'SIGINT' if signum == signal.SIGINT else 'SIGTERM'
-        
-        # If already cleaning up, force exit
-        if self._is_cleaning_up:
-            print("\n❌ Force shutdown during cleanup - some data may be lost")
-            sys.exit(1)
-        
-        print(f"\n⚠️  Received {signal_name} - initiating graceful shutdown...")
-        print("   Completing current operation, please wait...")
-        print("   (Press Ctrl+C again to force quit - may lose partial data)")
-
-        self._shutdown_requested = True
-
-        # If interrupted twice before cleanup, force exit
-        if hasattr(self, '_first_interrupt') and self._first_interrupt:
-            print("\n❌ Force shutdown requested - exiting immediately")
-            sys.exit(1)
+    @property
+    def _is_cleaning_up(self) -> bool:
+        """Flag to allow insert during cleanup."""
+        return _cleanup_event.is_set()
 
-        self._first_interrupt = True
+    @_is_cleaning_up.setter
+    def _is_cleaning_up(self, value: bool):
+        if value:
+            _cleanup_event.set()
+        else:
+            _cleanup_event.clear()
 
     def _cleanup(self):
         """
         Clean up resources and save partial progress.
         Called during shutdown or at the end of execution.
         """
-        if not self._partial_data:
+        if not self._partial_rows:
             return
             
         self._is_cleaning_up = True  # Allow insert to complete
@@ -75,14 +147,7 @@ class BaseLoader(ABC):
         print(f"{'='*60}")
 
         try:
-            # Combine partial data into DataFrame
-            if len(self._partial_data) > 1:
-                try:
-                    df = pl.concat(self._partial_data, how="diagonal")
-                except:
-                    df = pl.concat(self._partial_data, how="diagonal_relaxed")
-            else:
-                df = self._partial_data[0]
+            df = self._partial_frame()
 
             if not df.is_empty():
                 print(f"✓ Saving {len(df)} rows collected before shutdown...")
@@ -94,7 +159,191 @@ class BaseLoader(ABC):
             self._is_cleaning_up = False
 
         # Clear partial data
-        self._partial_data = []
+        self._clear_partial()
+
+    def _append_partial(self, df: pl.DataFrame):
+        """
+        Buffer a fetched frame until it is inserted.
+
+        Frames are kept column-wise (one list of Series per column) so the
+        final frame is built with one concat per column instead of a
+        diagonal concat across every frame. Columns missing on either side
+        are padded with nulls. Once FLUSH_THRESHOLD rows are buffered they
+        are inserted and released, so memory stays bounded.
+
+        Args:
+            df: Polars DataFrame fetched from the API
+        """
+        with self._partial_lock:
+            self._buffer_columns(df)
+            should_flush = self._partial_rows >= FLUSH_THRESHOLD
+
+        if should_flush:
+            self._flush_partial()
+
+    def _buffer_columns(self, df: pl.DataFrame):
+        """Add a frame's columns to the partial buffer (caller holds _partial_lock)."""
+        df = self._align_to_schema(df)
+        n_rows = len(df)
+
+        for series in df.get_columns():
+            if series.name not in self._partial_columns:
+                self._partial_columns[series.name] = []
+                if self._partial_rows:
+                    self._partial_columns[series.name].append(
+                        pl.repeat(None, self._partial_rows, dtype=series.dtype, eager=True).alias(series.name)
+                    )
+            self._partial_columns[series.name].append(series)
+
+        # Fixed-schema frames (the usual case) have every buffered column
+        if len(self._partial_columns) != df.width:
+            incoming = set(df.columns)
+            for name, series_list in self._partial_columns.items():
+                if name not in incoming:
+                    series_list.append(
+                        pl.repeat(None, n_rows, dtype=series_list[0].dtype, eager=True).alias(name)
+                    )
+
+        self._partial_rows += n_rows
+
+    def _align_to_schema(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Cast a frame to the canonical schema so buffered columns share dtypes.
+
+        With equal dtypes each column is built by a plain vertical concat;
+        the relaxed concat in _build_partial_frame is only a fallback. Only
+        widening casts are applied - if an incoming dtype doesn't fit the
+        canonical one, the canonical dtype is widened instead.
+
+        Args:
+            df: Incoming frame
+
+        Returns:
+            Frame with known columns cast to their canonical dtype
+        """
+        if self._canonical_schema is None:
+            self._canonical_schema = dict(df.schema)
+            return df
+
+        casts = []
+        for name, dtype in df.schema.items():
+            canonical = self._canonical_schema.get(name)
+            if canonical is None or canonical == pl.Null:
+                self._canonical_schema[name] = dtype
+            elif dtype != canonical:
+                supertype = self._supertype(canonical, dtype)
+                if supertype == canonical:
+                    casts.append(pl.col(name).cast(canonical))
+                else:
+                    self._canonical_schema[name] = supertype
+                    if supertype != dtype:
+                        casts.append(pl.col(name).cast(supertype))
+
+        return df.with_columns(casts) if casts else df
+
+    @staticmethod
+    def _supertype(left: pl.DataType, right: pl.DataType) -> pl.DataType:
+        """Dtype Polars' relaxed concat would pick for two column dtypes."""
+        try:
+            return pl.concat(
+                [pl.DataFrame(schema={'c': left}), pl.DataFrame(schema={'c': right})],
+                how="vertical_relaxed"
+            ).schema['c']
+        except Exception:
+            return pl.String
+
+    def _flush_partial(self, force: bool = False):
+        """
+        Hand buffered rows to the background insert thread and release them.
+
+        Inserts run on a single consumer thread, so fetch workers keep
+        calling the API while earlier rows are written, and flushes never
+        overlap each other. If more than MAX_PENDING_FLUSHES frames are
+        still queued, the flushing worker waits for the oldest, so memory
+        stays bounded when the database is slower than the API.
+
+        Args:
+            force: Flush even if fewer than FLUSH_THRESHOLD rows are buffered
+        """
+        with self._partial_lock:
+            if not self._partial_rows or (not force and self._partial_rows < FLUSH_THRESHOLD):
+                return
+            df = self._build_partial_frame()
+            self._partial_columns = {}
+            self._partial_rows = 0
+
+            if self._flush_executor is None:
+                self._flush_executor = ThreadPoolExecutor(max_workers=1)
+            self._pending_flushes.append(self._flush_executor.submit(self._insert_flushed, df))
+            backlog = [future for future in self._pending_flushes if not future.done()]
+
+        # Wait outside the lock: a failed flush re-buffers its rows under it
+        if len(backlog) > MAX_PENDING_FLUSHES:
+            backlog[0].result()
+
+    def _insert_flushed(self, df: pl.DataFrame):
+        """
+        Insert one flushed frame (runs on the flush thread).
+
+        Args:
+            df: Rows taken from the partial buffer
+        """
+        if VERBOSE:
+            print(f"  💾 Flushing {len(df)} buffered rows into {self.table_name}...")
+
+        try:
+            self._begin_bulk_session(len(df))
+            self._force_insert_data(df)
+            self._flushed_rows += len(df)
+        except Exception as e:
+            print(f"❌ Flush failed, keeping rows buffered: {e}")
+            with self._partial_lock:
+                self._buffer_columns(df)
+
+    def _wait_for_flushes(self):
+        """Block until every queued flush insert has finished."""
+        while True:
+            with self._partial_lock:
+                pending, self._pending_flushes = self._pending_flushes, []
+            if not pending:
+                return
+            for future in pending:
+                future.result()
+
+    def _partial_frame(self) -> pl.DataFrame:
+        """
+        Build one DataFrame from the partial data not yet flushed.
+
+        Waits for in-flight flushes first, so rows from a failed flush are
+        back in the buffer and nothing is inserted twice.
+
+        Returns:
+            Polars DataFrame with all buffered rows
+        """
+        self._wait_for_flushes()
+
+        with self._partial_lock:
+            return self._build_partial_frame()
+
+    def _build_partial_frame(self) -> pl.DataFrame:
+        """Concatenate the buffered columns (caller holds _partial_lock)."""
+        columns = {}
+        for name, series_list in self._partial_columns.items():
+            try:
+                # Chunks are fine for iter_rows/write_csv, so skip the contiguous copy
+                columns[name] = pl.concat(series_list, rechunk=False)
+            except Exception:
+                # Mismatched dtypes across frames - let Polars pick a supertype
+                columns[name] = pl.concat(
+                    [s.to_frame() for s in series_list], how="vertical_relaxed", rechunk=False
+                ).to_series()
+        return pl.DataFrame(columns)
+
+    def _clear_partial(self):
+        """Drop all partial data."""
+        with self._partial_lock:
+            self._partial_columns = {}
+            self._partial_rows = 0
 
     def _force_insert_data(self, df: pl.DataFrame):
         """
@@ -108,39 +357,30 @@ class BaseLoader(ABC):
             print(f"⚠️  No data to insert into {self.table_name}")
             return
 
-        # Prepare SQL
         columns = df.columns
-        placeholders = ", ".join(["%s"] * len(columns))
-        cols_str = ", ".join(columns)
+        df = self._sanitize_df(df)
 
-        sql = f"REPLACE INTO {self.table_name} ({cols_str}) VALUES ({placeholders})"
-        rows = [self._clean_row_for_mysql(row) for row in df.to_numpy().tolist()]
+        if len(df) >= BULK_LOAD_THRESHOLD and self._try_bulk_load(df):
+            return
 
         total_inserted = 0
 
-        with get_db() as conn:
+        # Full batches all share one statement, so prepare it server-side once
+        with self._connection() as conn, self._prepared_cursor(conn) as prepared_cursor:
             cursor = conn.cursor()
 
-            # Insert in batches - NO shutdown check here
-            for i in range(0, len(rows), BATCH_SIZE):
-                batch = rows[i:i + BATCH_SIZE]
+            batch_size = self._batch_size(conn, df)
 
-                try:
-                    cursor.executemany(sql, batch)
-                    total_inserted += len(batch)
-
-                    if VERBOSE:
-                        print(f"  ✓ Inserted batch: {len(batch)} rows (total: {total_inserted}/{len(rows)})")
+            # Insert in batches - NO shutdown check here
+            for batch_num, batch in enumerate(self._chunked_rows(df, batch_size), 1):
+                total_inserted += self._insert_batch(
+                    prepared_cursor if len(batch) == batch_size else cursor,
+                    columns, batch, respect_shutdown=False
+                )
+                conn.commit()  # Keep each transaction to one batch
 
-                except Exception as e:
-                    print(f"❌ Batch insert failed: {e}")
-                    # Try inserting rows individually
-                    for row in batch:
-                        try:
-                            cursor.execute(sql, row)
-                            total_inserted += 1
-                        except Exception as row_error:
-                            print(f"⚠️  Failed to insert row: {row_error}")
+                if VERBOSE and batch_num % LOG_EVERY_BATCHES == 0:
+                    print(f"  ✓ Inserted {batch_num} batches (total: {total_inserted}/{len(df)})")
 
         print(f"✓ Inserted {total_inserted} rows into {self.table_name}")
 
@@ -194,9 +434,11 @@ class BaseLoader(ABC):
         if 'timeout' not in kwargs:
             kwargs['timeout'] = API_TIMEOUT
 
-        # Rate limiting with jitter to make timing less predictable
-        jitter = random.uniform(1, 3)  # Random 1-3 second
-        time.sleep(API_RATE_LIMIT + jitter)
+        # Rate limiting shared by all worker threads. The bucket refills on
+        # wall-clock time, so latency of the previous call already counts
+        # toward the interval; only a small jitter is added on top.
+        self._rate_limiter.acquire()
+        time.sleep(random.uniform(0, 0.5))
 
         for attempt in range(API_MAX_RETRIES):
             # Check for shutdown during retries
@@ -205,10 +447,15 @@ class BaseLoader(ABC):
                     print("⚠️  Aborting API retry due to shutdown request")
                 return None
 
+            session = NBAStatsHTTP.get_session()
             try:
                 return func(*args, **kwargs)
             except Exception as e:
                 error_str = str(e).lower()
+
+                # Timeouts can leave dead sockets pooled; retry on a new session
+                if isinstance(e, (requests.Timeout, requests.ConnectionError)):
+                    reset_session(session)
                 
                 # Don't retry on "resultSet" errors - these are players with no data
                 # This is not a network issue, just missing data
@@ -237,6 +484,74 @@ class BaseLoader(ABC):
                     print(f"   Retrying in {wait_time}s...")
                 time.sleep(wait_time)
 
+    def fetch_concurrently(self, fetch_fn, tasks, max_workers, cooldown_interval=None, executor=None):
+        """
+        Run fetch_fn over tasks on a bounded thread pool.
+
+        API calls are I/O-bound, so workers overlap network latency while
+        api_call's shared rate limiter keeps the aggregate request rate
+        unchanged. The old cool-down (pause COOLDOWN_TIME after every
+        `cooldown_interval` fetches) is folded into a second token bucket
+        with the same long-run rate, so requests are spread evenly instead
+        of bursting and then idling. Pending tasks are cancelled once
+        shutdown is requested.
+
+        Args:
+            fetch_fn: Callable run as fetch_fn(*task) in a worker thread
+            tasks: Iterable of argument tuples
+            max_workers: Maximum concurrent fetches
+            cooldown_interval: Spread a COOLDOWN_TIME break over every N
+                fetches (None to disable)
+            executor: Existing pool to submit to (left running); a new
+                pool of max_workers is used if omitted
+
+        Yields:
+            Non-None results of fetch_fn, in completion order
+        """
+        pacer = None
+        if cooldown_interval:
+            # N calls per (N rate-limited calls + one cool-down), smoothed
+            period = cooldown_interval * API_RATE_LIMIT + COOLDOWN_TIME
+            pacer = TokenBucket(rate=cooldown_interval / period, burst=API_BURST)
+
+        def run_task(task):
+            if self._shutdown_requested:
+                return None
+
+            if pacer is not None:
+                pacer.acquire()
+
+            return fetch_fn(*task)
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        futures = [executor.submit(run_task, task) for task in tasks]
+
+        try:
+            for future in as_completed(futures):
+                if self._shutdown_requested:
+                    break
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if VERBOSE:
+                        print(f"    ❌ Exception in parallel fetch ({e})")
+                    continue
+
+                if result is not None:
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
+            # Running tasks still write to shared state (the partial buffer,
+            # the shared connection), so wait for them even on a borrowed pool
+            wait([future for future in futures if not future.cancelled()])
+            if owns_executor:
+                executor.shutdown(wait=True)
+
     def retry_failed_attempts(self):
         """
         Retry all failed API calls that were collected during execution.
@@ -282,37 +597,543 @@ class BaseLoader(ABC):
         
         return results
         
+    @contextmanager
+    def _shared_connection(self):
+        """
+        Open one connection and keep it on the loader for the block's duration.
+
+        Every helper that goes through _connection() reuses it instead of
+        paying a new connect + handshake.
+        """
+        with get_db() as conn:
+            self._conn = conn
+            try:
+                yield conn
+            finally:
+                # Pooled sessions aren't reset, so deallocate the statement first
+                self._close_prepared()
+                self._conn = None
+
+    @contextmanager
+    def _prepared_cursor(self, conn):
+        """
+        Yield a server-side prepared cursor, reused across inserts on the shared connection.
+
+        The cursor only re-prepares when given a different SQL object, and
+        _insert_sql hands back the same cached string for a batch shape, so
+        every flush and the final insert share one PREPARE. A reconnect
+        (new connection_id) gets a fresh cursor. On any other connection the
+        cursor is closed when the block exits, since pooled sessions are not
+        reset and would keep the prepared statement alive.
+
+        Args:
+            conn: Connection the insert runs on
+
+        Yields:
+            Prepared cursor on conn
+        """
+        if conn is not self._conn:
+            cursor = conn.cursor(prepared=True)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        if self._prepared is None or self._prepared[0] != conn.connection_id:
+            self._close_prepared()
+            self._prepared = (conn.connection_id, conn.cursor(prepared=True))
+        yield self._prepared[1]
+
+    def _close_prepared(self):
+        """Close the cached prepared cursor, if any, releasing its server-side statement."""
+        if self._prepared is None:
+            return
+
+        _, cursor = self._prepared
+        self._prepared = None
+        try:
+            cursor.close()
+        except Exception:
+            pass  # Its connection is already gone (e.g. after a reconnect)
+
+    @contextmanager
+    def _connection(self):
+        """
+        Yield the loader's shared connection, or a fresh one outside run().
+
+        The shared connection is pinged first so a long API fetch that
+        outlives MySQL's wait_timeout transparently reconnects.
+        """
+        if self._conn is not None:
+            self._conn.ping(reconnect=True, attempts=3, delay=5)
+            yield self._conn
+        else:
+            with get_db() as conn:
+                yield conn
+
+    @contextmanager
+    def _bulk_insert_session(self, n_rows: int):
+        """
+        Relax per-row checks on the shared session for the duration of a load.
+
+        unique_checks and foreign_key_checks are turned off for the block.
+        For a cold load (empty table, at least BULK_LOAD_THRESHOLD rows) the
+        secondary indexes are also dropped and rebuilt afterwards in a single
+        ALTER TABLE, which sorts once instead of updating indexes per row.
+        Tables are InnoDB, where DISABLE KEYS is a no-op.
+
+        Args:
+            n_rows: Number of rows about to be inserted
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SET SESSION unique_checks=0")
+            cursor.execute("SET SESSION foreign_key_checks=0")
+
+            dropped = []
+            try:
+                if n_rows >= BULK_LOAD_THRESHOLD:
+                    dropped = self._drop_secondary_indexes(cursor)
+                yield
+            finally:
+                # Inserts may have pinged/reconnected, so don't reuse the old cursor
+                cursor = conn.cursor()
+                if dropped:
+                    self._restore_indexes(cursor, dropped)
+                cursor.execute("SET SESSION unique_checks=1")
+                cursor.execute("SET SESSION foreign_key_checks=1")
+
+    def _begin_bulk_session(self, n_rows: int):
+        """
+        Enter _bulk_insert_session once for the rest of run().
+
+        On large loads the first flush reaches the table before the final
+        insert, so the session (and the cold-load index drop) has to start
+        there rather than around insert_data.
+
+        Args:
+            n_rows: Number of rows in the first insert of the load
+        """
+        if self._bulk_session is not None or self._conn is None:
+            return
+
+        stack = ExitStack()
+        stack.enter_context(self._bulk_insert_session(n_rows))
+        self._bulk_session = stack
+
+    def _end_bulk_session(self):
+        """Wait for in-flight flushes, then restore session checks and indexes."""
+        self._wait_for_flushes()
+        if self._bulk_session is not None:
+            stack, self._bulk_session = self._bulk_session, None
+            stack.close()
+
+    @contextmanager
+    def _bulk_load(self):
+        """Close whatever bulk session the load started when the block exits."""
+        try:
+            yield
+        finally:
+            self._end_bulk_session()
+
+    def _drop_secondary_indexes(self, cursor) -> list[str]:
+        """
+        Drop the table's non-primary indexes if the table is empty.
+
+        Args:
+            cursor: Cursor on the shared connection
+
+        Returns:
+            List of ADD INDEX clauses that recreate the dropped indexes
+        """
+        cursor.execute(f"SELECT 1 FROM {self.table_name} LIMIT 1")
+        if cursor.fetchall():
+            return []
+
+        cursor.execute(f"SHOW INDEX FROM {self.table_name}")
+        names = cursor.column_names
+        indexes = {}
+        for row in cursor.fetchall():
+            idx = dict(zip(names, row))
+            if idx['Key_name'] == 'PRIMARY':
+                continue
+            col = idx['Column_name']
+            if idx.get('Sub_part'):
+                col = f"{col}({idx['Sub_part']})"
+            entry = indexes.setdefault(idx['Key_name'], {'unique': not int(idx['Non_unique']), 'cols': {}})
+            entry['cols'][int(idx['Seq_in_index'])] = col
+
+        if not indexes:
+            return []
+
+        clauses = [
+            f"ADD {'UNIQUE ' if idx['unique'] else ''}INDEX {name} "
+            f"({', '.join(col for _, col in sorted(idx['cols'].items()))})"
+            for name, idx in indexes.items()
+        ]
+        cursor.execute(
+            f"ALTER TABLE {self.table_name} " + ", ".join(f"DROP INDEX {name}" for name in indexes)
+        )
+
+        if VERBOSE:
+            print(f"ℹ️  Dropped {len(indexes)} secondary indexes for cold load")
+
+        return clauses
+
+    def _restore_indexes(self, cursor, clauses: list[str]):
+        """
+        Recreate indexes dropped by _drop_secondary_indexes in one pass.
+
+        Args:
+            cursor: Cursor on the shared connection
+            clauses: ADD INDEX clauses to apply
+        """
+        sql = f"ALTER TABLE {self.table_name} " + ", ".join(clauses)
+        try:
+            cursor.execute(sql)
+            if VERBOSE:
+                print(f"✓ Rebuilt {len(clauses)} secondary indexes")
+        except Exception as e:
+            print(f"❌ Failed to rebuild indexes on {self.table_name}: {e}")
+            print(f"   Run manually: {sql}")
+
+    def _add_missing_indexes(self, cursor):
+        """
+        Re-add declared secondary indexes that the table no longer has.
+
+        CREATE TABLE IF NOT EXISTS leaves an existing table alone, so indexes
+        dropped for a cold load that never reached _restore_indexes (e.g. the
+        process was killed) would otherwise stay missing. Idempotent: a table
+        that matches its DDL is left untouched.
+
+        Args:
+            cursor: Cursor on the shared connection
+        """
+        declared = {
+            match.group(2): match.group(0).strip()
+            for match in _INDEX_DEF.finditer(self.get_create_table_sql())
+        }
+        if not declared:
+            return
+
+        cursor.execute(f"SHOW INDEX FROM {self.table_name}")
+        key_col = cursor.column_names.index('Key_name')
+        existing = {row[key_col] for row in cursor.fetchall()}
+
+        missing = [
+            f"ADD {definition}" for name, definition in declared.items()
+            if name not in existing
+        ]
+        if missing:
+            print(f"⚠️  {self.table_name} is missing {len(missing)} secondary indexes - rebuilding")
+            self._restore_indexes(cursor, missing)
+
     def create_table(self):
-        """Create the raw table in database."""
-        from db import execute_sql
-        
+        """Create the raw table in database, restoring any missing indexes."""
         sql = self.get_create_table_sql()
-        execute_sql(sql)
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql)
+            self._add_missing_indexes(cursor)
+            conn.commit()
         
         if VERBOSE:
             print(f"✓ Table '{self.table_name}' is ready")
     
-    def _clean_row_for_mysql(self, row: list) -> list:
+    @staticmethod
+    def _rows_to_df(rows, columns: list[str], dtypes: dict | None = None) -> pl.DataFrame:
         """
-        Clean a row for MySQL insertion by converting NaN/inf to None.
-        
+        Build a DataFrame from row-oriented API data via one transpose.
+
+        Polars builds frames fastest from whole columns; handing it rows
+        (or dicts) makes it walk every cell per column.
+
         Args:
-            row: List of values
-            
+            rows: Sequence of row tuples/lists, in `columns` order
+            columns: Column names
+            dtypes: Optional column name -> Polars dtype overrides; values
+                that can't be cast become null, and floats in integer
+                columns are truncated
+
+        Returns:
+            Polars DataFrame with one Series per column
+        """
+        dtypes = dtypes or {}
+        col_values = list(zip(*rows)) if rows else [()] * len(columns)
+        return pl.DataFrame([
+            pl.Series(name, values, dtype=dtypes.get(name), strict=False)
+            for name, values in zip(columns, col_values)
+        ])
+
+    @staticmethod
+    def _chunked_rows(df: pl.DataFrame, size: int):
+        """
+        Yield rows of a DataFrame in lists of at most `size` tuples.
+
+        Each batch is a zero-copy slice converted with rows() straight from
+        the Arrow buffers, so only one batch is materialized as Python
+        objects at a time and no per-row generator step is involved.
+
+        Args:
+            df: Polars DataFrame to read
+            size: Maximum rows per batch
+
+        Yields:
+            List of row tuples
+        """
+        for batch in df.iter_slices(n_rows=size):
+            yield batch.rows()
+
+    def _sanitize_df(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Replace values MySQL can't store with nulls in a single Polars pass.
+
+        NaN/inf in float columns and the literal string 'nan' in string
+        columns become null, so rows can be extracted without per-cell checks.
+        This is the only cleanup step: the C extension (use_pure=False)
+        serializes parameters natively and has no converter hook for NaN.
+
+        Args:
+            df: Polars DataFrame to clean
+
+        Returns:
+            DataFrame with NaN/inf/'nan' replaced by null
+        """
+        exprs = []
+        for col, dtype in df.schema.items():
+            if dtype in (pl.Float32, pl.Float64):
+                # Null (and NaN/inf) fail is_finite, so they all fall through to null
+                exprs.append(pl.when(pl.col(col).is_finite()).then(pl.col(col)).alias(col))
+            elif dtype == pl.String:
+                # Anchored regex avoids lowercasing a copy of the whole column
+                exprs.append(
+                    pl.when(pl.col(col).str.contains(r"^(?i)nan$"))
+                    .then(None)
+                    .otherwise(pl.col(col))
+                    .alias(col)
+                )
+
+        return df.with_columns(exprs) if exprs else df
+
+    @staticmethod
+    def _batch_size(conn, df: pl.DataFrame) -> int:
+        """
+        Pick rows per multi-row insert so one statement fits in a packet.
+
+        Estimates the serialized size of a row from the first row and divides
+        the connection's max_allowed_packet by it, clamped to
+        [BATCH_SIZE, MAX_BATCH_SIZE] and to the 65535-placeholder limit of
+        prepared statements.
+
+        Args:
+            conn: Open connection (max_allowed_packet cached by get_db)
+            df: Sanitized DataFrame about to be inserted
+
+        Returns:
+            Number of rows per batch
+        """
+        n_cols = max(1, len(df.columns))
+        max_rows = min(MAX_BATCH_SIZE, MAX_PLACEHOLDERS // n_cols)
+
+        max_packet = getattr(conn, 'max_allowed_packet', None)
+        if not max_packet or df.is_empty():
+            return min(BATCH_SIZE, max_rows)
+
+        row_bytes = len(str(df.row(0))) + n_cols * 3
+        fit = (max_packet - 2048) // row_bytes
+        return min(max(BATCH_SIZE, fit), max_rows)
+
+    def _build_insert_sql(self, columns: list[str], n_rows: int) -> str:
+        """
+        Build a multi-row upsert statement for n_rows rows.
+
+        Uses INSERT ... ON DUPLICATE KEY UPDATE on the non-key columns so
+        colliding rows are updated in place. Falls back to REPLACE INTO when
+        the loader opts in via use_replace or doesn't declare pk_columns.
+
+        Args:
+            columns: Column names in row order
+            n_rows: Number of VALUES tuples in the statement
+
         Returns:
-            Cleaned list with NaN/inf replaced by None
-        """
-        cleaned = []
-        for val in row:
-            if val is None:
-                cleaned.append(None)
-            elif isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
-                cleaned.append(None)
-            elif isinstance(val, str) and val.lower() == 'nan':
-                cleaned.append(None)
-            else:
-                cleaned.append(val)
-        return cleaned
+            SQL string with one placeholder group per row
+        """
+        row_tpl = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        cols_str = ", ".join(columns)
+        values_str = ", ".join([row_tpl] * n_rows)
+
+        if self.use_replace or not self.pk_columns:
+            return f"REPLACE INTO {self.table_name} ({cols_str}) VALUES {values_str}"
+
+        updates = ", ".join(f"{c}=VALUES({c})" for c in self._update_columns(columns))
+
+        return (
+            f"INSERT INTO {self.table_name} ({cols_str}) VALUES {values_str} "
+            f"ON DUPLICATE KEY UPDATE {updates}"
+        )
+
+    def _update_columns(self, columns: list[str]) -> list[str]:
+        """Columns an upsert overwrites: everything but the primary key."""
+        pk = {c.lower() for c in self.pk_columns}
+        return [c for c in columns if c.lower() not in pk] or columns[:1]
+
+    def _insert_sql(self, columns: list[str], n_rows: int) -> str:
+        """
+        Return the insert statement for n_rows rows, building it at most once.
+
+        Args:
+            columns: Column names in row order
+            n_rows: Number of VALUES tuples in the statement
+
+        Returns:
+            SQL string from the loader's cache
+        """
+        key = (self.table_name, tuple(columns), n_rows)
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            sql = self._sql_cache[key] = self._build_insert_sql(columns, n_rows)
+        return sql
+
+    def _insert_batch(self, cursor, columns: list[str], batch: list,
+                      respect_shutdown: bool = True) -> int:
+        """
+        Insert a batch of rows with a single multi-row statement.
+
+        If the statement is rejected (e.g. it exceeds max_allowed_packet), the
+        batch is retried in FALLBACK_BATCH_SIZE chunks, and failing chunks are
+        retried one row at a time.
+
+        Args:
+            cursor: Open database cursor (plain or prepared)
+            columns: Column names in row order
+            batch: List of row tuples
+            respect_shutdown: Stop row-by-row retries if shutdown is requested
+
+        Returns:
+            Number of rows inserted
+        """
+        n_rows = len(batch)
+        sql = self._insert_sql(columns, n_rows)
+
+        try:
+            cursor.execute(sql, list(chain.from_iterable(batch)))
+            return n_rows
+        except Exception as e:
+            print(f"❌ Batch insert failed: {e}")
+
+        if n_rows > FALLBACK_BATCH_SIZE:
+            inserted = 0
+            for i in range(0, n_rows, FALLBACK_BATCH_SIZE):
+                if respect_shutdown and self._shutdown_requested and not self._is_cleaning_up:
+                    break
+                inserted += self._insert_batch(
+                    cursor, columns, batch[i:i + FALLBACK_BATCH_SIZE], respect_shutdown
+                )
+            return inserted
+
+        # Try inserting rows individually
+        row_sql = self._insert_sql(columns, 1)
+        inserted = 0
+        for row in batch:
+            if respect_shutdown and self._shutdown_requested and not self._is_cleaning_up:
+                break
+            try:
+                cursor.execute(row_sql, row)
+                inserted += 1
+            except Exception as row_error:
+                print(f"⚠️  Failed to insert row: {row_error}")
+        return inserted
+
+    def _bulk_load_data(self, df: pl.DataFrame):
+        """
+        Load a DataFrame with LOAD DATA LOCAL INFILE from a temporary CSV.
+
+        A single server-side parse replaces per-row parameter binding, which
+        is much faster than INSERT for large frames. The driver only
+        streams LOCAL INFILE from a path, so the CSV is written to
+        INFILE_DIR (tmpfs) to keep it in memory.
+
+        LOAD DATA has no upsert mode, and its REPLACE deletes and re-inserts
+        every colliding row. So unless the loader opts into REPLACE, a
+        non-empty table is loaded through a temporary staging table and
+        merged with one INSERT ... SELECT ... ON DUPLICATE KEY UPDATE.
+
+        Args:
+            df: Sanitized Polars DataFrame to load
+        """
+        # MySQL reads booleans as 0/1 and treats backslash as the escape char
+        exprs = []
+        for col, dtype in df.schema.items():
+            if dtype == pl.Boolean:
+                exprs.append(pl.col(col).cast(pl.Int8))
+            elif dtype == pl.String:
+                exprs.append(pl.col(col).str.replace_all("\\", "\\\\", literal=True))
+        if exprs:
+            df = df.with_columns(exprs)
+
+        fd, path = tempfile.mkstemp(suffix=".csv", dir=INFILE_DIR)
+        os.close(fd)
+
+        try:
+            df.write_csv(path, include_header=True, null_value="\\N")
+
+            cols_str = ", ".join(df.columns)
+
+            with self._connection() as conn:
+                cursor = conn.cursor()
+
+                # An empty table has nothing to collide with, so load it directly
+                stage = None
+                if not self.use_replace and self.pk_columns:
+                    cursor.execute(f"SELECT 1 FROM {self.table_name} LIMIT 1")
+                    if cursor.fetchall():
+                        stage = f"{self.table_name}_stage"
+                        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {stage}")
+                        cursor.execute(f"CREATE TEMPORARY TABLE {stage} LIKE {self.table_name}")
+
+                cursor.execute(f"""
+                    LOAD DATA LOCAL INFILE '{path}'
+                    REPLACE INTO TABLE {stage or self.table_name}
+                    FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+                    LINES TERMINATED BY '\\n'
+                    IGNORE 1 LINES
+                    ({cols_str})
+                """)
+
+                if stage:
+                    updates = ", ".join(f"{c}=s.{c}" for c in self._update_columns(df.columns))
+                    try:
+                        cursor.execute(
+                            f"INSERT INTO {self.table_name} ({cols_str}) "
+                            f"SELECT {cols_str} FROM {stage} AS s "
+                            f"ON DUPLICATE KEY UPDATE {updates}"
+                        )
+                    finally:
+                        cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {stage}")
+
+                conn.commit()
+        finally:
+            os.remove(path)
+
+    def _try_bulk_load(self, df: pl.DataFrame) -> bool:
+        """
+        Attempt a bulk load, reporting whether the caller can skip batch inserts.
+
+        Args:
+            df: Sanitized Polars DataFrame to load
+
+        Returns:
+            bool: True if the bulk load succeeded, False to fall back
+        """
+        try:
+            self._bulk_load_data(df)
+            print(f"✓ Bulk loaded {len(df)} rows into {self.table_name}")
+            return True
+        except Exception as e:
+            print(f"⚠️  Bulk load failed ({e}) - falling back to batch inserts")
+            return False
 
     def insert_data(self, df: pl.DataFrame):
         """
@@ -325,49 +1146,38 @@ class BaseLoader(ABC):
             print(f"⚠️  No data to insert into {self.table_name}")
             return
 
-        # Prepare SQL
         columns = df.columns
-        placeholders = ", ".join(["%s"] * len(columns))
-        cols_str = ", ".join(columns)
 
-        # REPLACE INTO handles duplicates automatically
-        sql = f"REPLACE INTO {self.table_name} ({cols_str}) VALUES ({placeholders})"
+        # Clean NaN values in Polars; rows are streamed from Arrow buffers per batch
+        df = self._sanitize_df(df)
 
-        # Convert DataFrame to list of tuples and clean NaN values
-        rows = [self._clean_row_for_mysql(row) for row in df.to_numpy().tolist()]
+        # Large frames go through LOAD DATA; smaller ones use multi-row inserts
+        if len(df) >= BULK_LOAD_THRESHOLD and self._try_bulk_load(df):
+            return
 
         total_inserted = 0
 
-        with get_db() as conn:
+        # Full batches all share one statement, so prepare it server-side once
+        with self._connection() as conn, self._prepared_cursor(conn) as prepared_cursor:
             cursor = conn.cursor()
 
+            batch_size = self._batch_size(conn, df)
+
             # Insert in batches
-            for i in range(0, len(rows), BATCH_SIZE):
+            for batch_num, batch in enumerate(self._chunked_rows(df, batch_size), 1):
                 # Check for shutdown between batches (but not during cleanup)
                 if self._shutdown_requested and not self._is_cleaning_up:
-                    print(f"\n⚠️  Shutdown requested - stopping insert (saved {total_inserted}/{len(rows)} rows)")
+                    print(f"\n⚠️  Shutdown requested - stopping insert (saved {total_inserted}/{len(df)} rows)")
                     break
 
-                batch = rows[i:i + BATCH_SIZE]
-
-                try:
-                    cursor.executemany(sql, batch)
-                    total_inserted += len(batch)
-
-                    if VERBOSE:
-                        print(f"  ✓ Inserted batch: {len(batch)} rows (total: {total_inserted}/{len(rows)})")
+                total_inserted += self._insert_batch(
+                    prepared_cursor if len(batch) == batch_size else cursor,
+                    columns, batch
+                )
+                conn.commit()  # Keep each transaction to one batch
 
-                except Exception as e:
-                    print(f"❌ Batch insert failed: {e}")
-                    # Try inserting rows individually
-                    for row in batch:
-                        if self._shutdown_requested and not self._is_cleaning_up:
-                            break
-                        try:
-                            cursor.execute(sql, row)
-                            total_inserted += 1
-                        except Exception as row_error:
-                            print(f"⚠️  Failed to insert row: {row_error}")
+                if VERBOSE and batch_num % LOG_EVERY_BATCHES == 0:
+                    print(f"  ✓ Inserted {batch_num} batches (total: {total_inserted}/{len(df)})")
 
         print(f"✓ Inserted {total_inserted} rows into {self.table_name}")
     
@@ -379,48 +1189,61 @@ class BaseLoader(ABC):
         3. Insert data
         4. Cleanup
         """
+        _install_signal_handlers()
+        install_session(getattr(self, 'max_workers', None) or API_WORKERS, cache=self.cache_http)
+
         try:
-            print(f"\n{'='*60}")
-            print(f"Loading: {self.table_name}")
-            print(f"{'='*60}")
+            # One connection for table creation, inserts and cleanup
+            with self._shared_connection(), self._bulk_load():
+                print(f"\n{'='*60}")
+                print(f"Loading: {self.table_name}")
+                print(f"{'='*60}")
 
-            # Step 1: Create table
-            if self._shutdown_requested:
-                print("⚠️  Shutdown requested before table creation")
-                return
+                # Step 1: Create table
+                if self._shutdown_requested:
+                    print("⚠️  Shutdown requested before table creation")
+                    return
 
-            self.create_table()
+                self.create_table()
 
-            # Step 2: Fetch data
-            if self._shutdown_requested:
-                print("⚠️  Shutdown requested before data fetch")
-                return
+                # Step 2: Fetch data
+                if self._shutdown_requested:
+                    print("⚠️  Shutdown requested before data fetch")
+                    return
 
-            print("Fetching data from NBA API...")
-            df = self.fetch_data()
+                print("Fetching data from NBA API...")
+                df = self.fetch_data()
 
-            if self._shutdown_requested:
-                print("⚠️  Shutdown requested during data fetch")
-                self._cleanup()
-                return
+                if self._shutdown_requested:
+                    print("⚠️  Shutdown requested during data fetch")
+                    self._cleanup()
+                    return
 
-            print(f"✓ Fetched {len(df)} rows")
+                if self._flushed_rows:
+                    print(f"✓ Fetched {len(df) + self._flushed_rows} rows ({self._flushed_rows} already inserted)")
+                else:
+                    print(f"✓ Fetched {len(df)} rows")
 
-            # Step 3: Insert data
-            if self._shutdown_requested:
-                print("⚠️  Shutdown requested before data insert")
-                self._cleanup()
-                return
+                # Step 3: Insert data
+                if self._shutdown_requested:
+                    print("⚠️  Shutdown requested before data insert")
+                    self._cleanup()
+                    return
 
-            print("Inserting data into database...")
-            self.insert_data(df)
+                print("Inserting data into database...")
+                self._begin_bulk_session(len(df))
+                self.insert_data(df)
 
-            if not self._shutdown_requested:
-                print(f"{'='*60}")
-                print(f"✓ {self.table_name} loading complete!\n")
-            else:
-                print(f"{'='*60}")
-                print(f"⚠️  {self.table_name} loading interrupted\n")
+                # Buffered rows are now in the table; don't re-insert them in cleanup
+                if not self._shutdown_requested:
+                    self._clear_partial()
+
+                if not self._shutdown_requested:
+                    print(f"{'='*60}")
+                    print(f"✓ {self.table_name} loading complete!\n")
+                else:
+                    print(f"{'='*60}")
+                    print(f"⚠️  {self.table_name} loading interrupted\n")
 
         except KeyboardInterrupt:
             print("\n⚠️  KeyboardInterrupt caught - cleaning up...")
@@ -432,5 +1255,14 @@ class BaseLoader(ABC):
             raise
         finally:
             # Always attempt cleanup if there's partial data
-            if self._partial_data:
+            if self._partial_rows:
                 self._cleanup()
+            self.close()
+
+    def close(self):
+        """Release loader resources (worker pools etc.). Called at the end of run()."""
+        if self._flush_executor is not None:
+            self._wait_for_flushes()
+            self._flush_executor.shutdown(wait=True)
+            self._flush_executor = None
+        self._close_prepared()
@@ -1,14 +1,26 @@
 """Load player game logs data."""
 import time
-import math
+from collections import defaultdict
 import polars as pl
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
 from nba_api.stats.endpoints import playergamelog
-from nba_api.stats.static import players
 from loaders.base import BaseLoader
-from db import get_db
-from config import START_SEASON, END_SEASON, VERBOSE, COOLDOWN_TIME
+from loaders.static_data import get_all_players
+from config import START_SEASON, END_SEASON, VERBOSE, PROGRESS_INTERVAL, format_season
+
+
+# Column types for PlayerGameLog rows, matching raw_player_game_logs
+GAMELOG_SCHEMA = {
+    'SEASON_ID': pl.String, 'Player_ID': pl.Int64, 'Game_ID': pl.String,
+    'GAME_DATE': pl.String, 'MATCHUP': pl.String, 'WL': pl.String, 'MIN': pl.String,
+    'FGM': pl.Float64, 'FGA': pl.Float64, 'FG_PCT': pl.Float64,
+    'FG3M': pl.Float64, 'FG3A': pl.Float64, 'FG3_PCT': pl.Float64,
+    'FTM': pl.Float64, 'FTA': pl.Float64, 'FT_PCT': pl.Float64,
+    'OREB': pl.Float64, 'DREB': pl.Float64, 'REB': pl.Float64,
+    'AST': pl.Float64, 'STL': pl.Float64, 'BLK': pl.Float64,
+    'TOV': pl.Float64, 'PF': pl.Float64, 'PTS': pl.Float64,
+    'PLUS_MINUS': pl.Float64, 'VIDEO_AVAILABLE': pl.Float64,
+}
 
 
 class GameLogsLoader(BaseLoader):
@@ -24,10 +36,12 @@ class GameLogsLoader(BaseLoader):
         use_career_stats=True,
         resume=False,
         active_only=False,
-        start_player=0
+        start_player=0,
+        cache_http=False
     ):
         super().__init__()
         self.table_name = "raw_player_game_logs"
+        self.pk_columns = ('Game_ID', 'Player_ID')
         self.start_season = start_season or START_SEASON
         self.end_season = end_season or END_SEASON
         self.limit_players = limit_players
@@ -37,28 +51,28 @@ class GameLogsLoader(BaseLoader):
         self.resume = resume
         self.active_only = active_only
         self.start_player = start_player
-        self._lock = Lock()
+        self.cache_http = cache_http
+        # One pool for the whole run instead of one per player
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
         self._player_seasons = {}
+        self._career_seasons_in_range = {}
+        self._default_seasons = []
+        self._loaded_season_strings = {}
         self._loaded_player_seasons = {}
         self._active_player_ids = set()
 
     def _get_loaded_player_seasons(self) -> dict:
         """Get player IDs and their seasons already in the game logs database."""
         try:
-            with get_db() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"""
-                    SELECT Player_ID, SEASON_ID 
-                    FROM {self.table_name}
-                    GROUP BY Player_ID, SEASON_ID
-                """)
-                rows = cursor.fetchall()
+            with self._connection() as conn:
+                # Unbuffered cursor: rows stream from the server as we iterate
+                cursor = conn.cursor(buffered=False)
+                cursor.execute(f"SELECT DISTINCT Player_ID, SEASON_ID FROM {self.table_name}")
 
-                loaded = {}
-                for player_id, season_id in rows:
-                    if player_id not in loaded:
-                        loaded[player_id] = set()
+                loaded = defaultdict(set)
+                for player_id, season_id in cursor:
                     loaded[player_id].add(season_id)
+                loaded = dict(loaded)
 
                 total_combinations = sum(len(seasons) for seasons in loaded.values())
                 print(f"✓ Found {len(loaded)} players with {total_combinations} player-season combinations in game logs")
@@ -70,7 +84,7 @@ class GameLogsLoader(BaseLoader):
     def _get_active_player_ids(self) -> set:
         """Get active player IDs from raw_players table."""
         try:
-            with get_db() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id FROM raw_players WHERE is_active = 1")
                 rows = cursor.fetchall()
@@ -84,21 +98,18 @@ class GameLogsLoader(BaseLoader):
     def _load_player_seasons_from_career_stats(self) -> dict:
         """Load seasons for each player from raw_player_career_stats."""
         try:
-            with get_db() as conn:
-                cursor = conn.cursor()
+            with self._connection() as conn:
+                cursor = conn.cursor(buffered=False)
                 cursor.execute("""
-                    SELECT PLAYER_ID, SEASON_ID 
+                    SELECT DISTINCT PLAYER_ID, SEASON_ID
                     FROM raw_player_career_stats
                     WHERE LEAGUE_ID = '00'
-                    GROUP BY PLAYER_ID, SEASON_ID
                 """)
-                rows = cursor.fetchall()
 
-                player_seasons = {}
-                for player_id, season_id in rows:
-                    if player_id not in player_seasons:
-                        player_seasons[player_id] = set()
+                player_seasons = defaultdict(set)
+                for player_id, season_id in cursor:
                     player_seasons[player_id].add(season_id)
+                player_seasons = dict(player_seasons)
 
                 total_seasons = sum(len(seasons) for seasons in player_seasons.values())
                 print(f"✓ Loaded {total_seasons} player-season combinations from raw_player_career_stats")
@@ -110,14 +121,22 @@ class GameLogsLoader(BaseLoader):
             print("   Make sure to run player_career loader first!")
             return {}
 
-    def _get_seasons_for_player(self, player_id: int) -> list[str]:
-        """Get the list of seasons to fetch for a specific player."""
+    def _prepare_seasons(self):
+        """
+        Precompute each player's seasons in range once, before the player loop.
+
+        Season strings are parsed once per player here instead of on every
+        _get_seasons_for_player call.
+        """
         min_season_year = self.start_season
         max_season_year = self.end_season - 1
 
-        if self.use_career_stats and player_id in self._player_seasons:
-            career_seasons = self._player_seasons[player_id]
+        self._default_seasons = [
+            format_season(year) for year in range(self.start_season, self.end_season)
+        ]
 
+        self._career_seasons_in_range = {}
+        for player_id, career_seasons in self._player_seasons.items():
             filtered_seasons = []
             for season in career_seasons:
                 try:
@@ -126,62 +145,33 @@ class GameLogsLoader(BaseLoader):
                         filtered_seasons.append(season)
                 except (ValueError, IndexError):
                     continue
+            self._career_seasons_in_range[player_id] = sorted(filtered_seasons)
+
+        # Loaded SEASON_IDs look like '22023'; store them as '2023-24' so the
+        # resume filter is a plain set lookup
+        self._loaded_season_strings = {}
+        for player_id, season_ids in self._loaded_player_seasons.items():
+            loaded = set()
+            for season_id in season_ids:
+                try:
+                    year = int(season_id[1:])
+                except (TypeError, ValueError):
+                    continue
+                loaded.add(format_season(year))
+            self._loaded_season_strings[player_id] = frozenset(loaded)
 
-            seasons = sorted(filtered_seasons)
+    def _get_seasons_for_player(self, player_id: int) -> list[str]:
+        """Get the list of seasons to fetch for a specific player."""
+        if self.use_career_stats and player_id in self._career_seasons_in_range:
+            seasons = self._career_seasons_in_range[player_id]
         else:
-            seasons = [
-                f"{year}-{str(year + 1)[-2:]}"
-                for year in range(self.start_season, self.end_season)
-            ]
-
-        if self.resume and player_id in self._loaded_player_seasons:
-            loaded_season_ids = self._loaded_player_seasons[player_id]
-            seasons_to_fetch = []
-            for season in seasons:
-                year = int(season.split('-')[0])
-                season_id = f"2{year}"
-                if season_id not in loaded_season_ids:
-                    seasons_to_fetch.append(season)
-            return seasons_to_fetch
+            seasons = self._default_seasons
 
-        return seasons
+        loaded = self._loaded_season_strings.get(player_id)
+        if loaded:
+            return [s for s in seasons if s not in loaded]
 
-    def _normalize_dataframe(self, df: pl.DataFrame) -> pl.DataFrame:
-        """Normalize DataFrame columns to consistent types."""
-        schema = {
-            'SEASON_ID': pl.String, 'Player_ID': pl.Int64, 'Game_ID': pl.String,
-            'GAME_DATE': pl.String, 'MATCHUP': pl.String, 'WL': pl.String, 'MIN': pl.String,
-            'FGM': pl.Float64, 'FGA': pl.Float64, 'FG_PCT': pl.Float64,
-            'FG3M': pl.Float64, 'FG3A': pl.Float64, 'FG3_PCT': pl.Float64,
-            'FTM': pl.Float64, 'FTA': pl.Float64, 'FT_PCT': pl.Float64,
-            'OREB': pl.Float64, 'DREB': pl.Float64, 'REB': pl.Float64,
-            'AST': pl.Float64, 'STL': pl.Float64, 'BLK': pl.Float64,
-            'TOV': pl.Float64, 'PF': pl.Float64, 'PTS': pl.Float64,
-            'PLUS_MINUS': pl.Float64, 'VIDEO_AVAILABLE': pl.Float64,
-        }
-
-        for col, dtype in schema.items():
-            if col in df.columns:
-                try:
-                    df = df.with_columns(pl.col(col).cast(dtype))
-                except Exception:
-                    df = df.with_columns(pl.col(col).cast(pl.String))
-
-        return df
-
-    def _clean_row_for_mysql(self, row: list) -> list:
-        """Clean a row for MySQL insertion."""
-        cleaned = []
-        for val in row:
-            if val is None:
-                cleaned.append(None)
-            elif isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
-                cleaned.append(None)
-            elif isinstance(val, str) and val.lower() == 'nan':
-                cleaned.append(None)
-            else:
-                cleaned.append(val)
-        return cleaned
+        return seasons
 
     def _fetch_season_for_player(self, player_id: int, player_name: str, season: str) -> pl.DataFrame | None:
         """Fetch game logs for a single player-season combination."""
@@ -199,56 +189,22 @@ class GameLogsLoader(BaseLoader):
             if gamelog is None:
                 return None
 
-            df_pandas = gamelog.get_data_frames()[0]
-
-            if not df_pandas.empty:
-                df_pandas = df_pandas.infer_objects(copy=False)
-                df_polars = pl.from_pandas(df_pandas)
-                df_polars = self._normalize_dataframe(df_polars)
-
-                with self._lock:
-                    self._partial_data.append(df_polars)
+            # Build straight from the JSON rowSet with a declared schema
+            result_set = gamelog.get_dict()['resultSets'][0]
+            rows = result_set['rowSet']
 
-                if VERBOSE:
-                    with self._lock:
-                        print(f"    ✓ {season}: {len(df_polars)} games")
+            if rows:
+                df_polars = self._rows_to_df(rows, result_set['headers'], GAMELOG_SCHEMA)
 
+                self._append_partial(df_polars)
                 return df_polars
 
         except Exception as e:
             if VERBOSE:
-                with self._lock:
-                    print(f"    ⚠️  {season}: No data ({e})")
+                print(f"    ⚠️  {player_name} {season}: No data ({e})")
 
         return None
 
-    def _fetch_seasons_parallel(self, player_id: int, player_name: str, seasons: list[str]) -> list[pl.DataFrame]:
-        """Fetch multiple seasons for a player in parallel."""
-        results = []
-
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_season = {
-                executor.submit(self._fetch_season_for_player, player_id, player_name, season): season
-                for season in seasons
-            }
-
-            for future in as_completed(future_to_season):
-                if self.check_shutdown():
-                    for f in future_to_season:
-                        f.cancel()
-                    break
-
-                try:
-                    df = future.result()
-                    if df is not None:
-                        results.append(df)
-                except Exception as e:
-                    if VERBOSE:
-                        with self._lock:
-                            print(f"    ❌ Exception in parallel fetch ({e})")
-
-        return results
-
     def fetch_data(self) -> pl.DataFrame:
         """Fetch game logs for all players."""
         if self.use_career_stats:
@@ -264,7 +220,7 @@ class GameLogsLoader(BaseLoader):
             if not self._active_player_ids:
                 print("⚠️  No active players found. Run players loader first.")
 
-        all_players = players.get_players()
+        all_players = get_all_players()
         total_players = len(all_players)
 
         if self.start_player > 0:
@@ -275,6 +231,8 @@ class GameLogsLoader(BaseLoader):
             all_players = all_players[:self.limit_players]
             print(f"ℹ️  Limited to {self.limit_players} players for testing")
 
+        self._prepare_seasons()
+
         print(f"ℹ️  Season bounds: {self.start_season} to {self.end_season}")
         if self.use_career_stats:
             print(f"   (Using actual seasons from raw_player_career_stats)")
@@ -285,52 +243,66 @@ class GameLogsLoader(BaseLoader):
 
         print(f"ℹ️  Fetching data for {len(all_players)} players")
         print(f"   Parallel workers: {self.max_workers}")
-        print(f"   Cool-down: Every {self.cooldown_interval} players")
+        print(f"   Cool-down: Every {self.cooldown_interval} requests")
 
-        all_logs = []
-        player_count = self.start_player
-        skipped_count = 0
+        # Narrow the player list with set operations before planning seasons
+        candidates = {player['id'] for player in all_players}
         skipped_inactive = 0
         skipped_no_career = 0
-        fetched_count = 0
 
-        for player in all_players:
-            if self.check_shutdown():
-                print(f"\n⚠️  Shutdown requested - stopping at player {player_count}/{total_players}")
-                break
+        if self.active_only:
+            active = candidates & self._active_player_ids
+            skipped_inactive = len(candidates) - len(active)
+            candidates = active
 
-            player_id = player['id']
-            player_name = player['full_name']
-            player_count += 1
+        if self.use_career_stats:
+            with_career = candidates & self._player_seasons.keys()
+            skipped_no_career = len(candidates) - len(with_career)
+            candidates = with_career
 
-            if self.active_only and player_id not in self._active_player_ids:
-                skipped_inactive += 1
-                continue
+        skipped_count = 0
+        fetched_count = 0
+        tasks = []
 
-            if self.use_career_stats and player_id not in self._player_seasons:
-                skipped_no_career += 1
+        for player in all_players:
+            player_id = player['id']
+            if player_id not in candidates:
                 continue
 
+            player_name = player['full_name']
             seasons = self._get_seasons_for_player(player_id)
 
             if not seasons:
                 skipped_count += 1
                 continue
 
-            if VERBOSE:
-                if len(seasons) == 1:
-                    print(f"  [{player_count}/{total_players}] {player_name} ({seasons[0]})...")
-                else:
-                    print(f"  [{player_count}/{total_players}] {player_name} ({len(seasons)} seasons)...")
-
             fetched_count += 1
-            if fetched_count > 0 and fetched_count % self.cooldown_interval == 0:
-                if VERBOSE:
-                    print(f"   💤 Taking a {COOLDOWN_TIME}s cool-down break...")
-                time.sleep(COOLDOWN_TIME)
+            tasks.extend((player_id, player_name, season) for season in seasons)
+
+        print(f"ℹ️  Queued {len(tasks)} player-seasons for {fetched_count} players")
+
+        # One queue of (player, season) pairs so a slow season never holds up
+        # the next player; pacing comes from the shared rate limiter.
+        # Results are buffered (and flushed) via _append_partial.
+        # Progress is printed from here on a timer, not per season by workers.
+        completed = 0
+        games = 0
+        last_report = time.monotonic()
+        for df in self.fetch_concurrently(
+            self._fetch_season_for_player, tasks, self.max_workers,
+            self.cooldown_interval, executor=self._executor
+        ):
+            completed += 1
+            games += len(df)
+            if VERBOSE and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                print(f"  [{completed}/{len(tasks)}] player-seasons fetched ({games} games)")
+                last_report = time.monotonic()
+
+        if VERBOSE and completed:
+            print(f"  [{completed}/{len(tasks)}] player-seasons fetched ({games} games)")
 
-            player_logs = self._fetch_seasons_parallel(player_id, player_name, seasons)
-            all_logs.extend(player_logs)
+        if self.check_shutdown():
+            print(f"\n⚠️  Shutdown requested - stopped after {completed}/{len(tasks)} player-seasons")
 
         print(f"\n📊 Summary:")
         print(f"   Total players: {total_players}")
@@ -343,59 +315,18 @@ class GameLogsLoader(BaseLoader):
         print(f"   Skipped (no seasons in range): {skipped_count}")
         print(f"   Players fetched: {fetched_count}")
 
-        if not all_logs:
-            print("⚠️  No new game logs to load")
-            return pl.DataFrame()
+        # Whatever wasn't flushed during the fetch
+        combined = self._partial_frame()
 
-        try:
-            combined = pl.concat(all_logs, how="diagonal")
-        except Exception:
-            combined = pl.concat(all_logs, how="diagonal_relaxed")
+        if combined.is_empty() and not self._flushed_rows:
+            print("⚠️  No new game logs to load")
 
         return combined
 
-    def insert_data(self, df: pl.DataFrame):
-        """Insert DataFrame into database."""
-        from db import get_db
-        from config import BATCH_SIZE
-
-        if df.is_empty():
-            print(f"⚠️  No data to insert into {self.table_name}")
-            return
-
-        columns = df.columns
-        placeholders = ", ".join(["%s"] * len(columns))
-        cols_str = ", ".join(columns)
-
-        sql = f"REPLACE INTO {self.table_name} ({cols_str}) VALUES ({placeholders})"
-        rows = [self._clean_row_for_mysql(row) for row in df.to_numpy().tolist()]
-
-        total_inserted = 0
-
-        with get_db() as conn:
-            cursor = conn.cursor()
-
-            for i in range(0, len(rows), BATCH_SIZE):
-                if self._shutdown_requested and not self._is_cleaning_up:
-                    break
-
-                batch = rows[i:i + BATCH_SIZE]
-
-                try:
-                    cursor.executemany(sql, batch)
-                    total_inserted += len(batch)
-                    if VERBOSE:
-                        print(f"  ✓ Inserted batch: {len(batch)} rows (total: {total_inserted}/{len(rows)})")
-                except Exception as e:
-                    print(f"❌ Batch insert failed: {e}")
-                    for row in batch:
-                        try:
-                            cursor.execute(sql, row)
-                            total_inserted += 1
-                        except Exception:
-                            pass
-
-        print(f"✓ Inserted {total_inserted} rows into {self.table_name}")
+    def close(self):
+        """Shut down the season fetch pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        super().close()
 
     def get_create_table_sql(self) -> str:
         return f"""
@@ -445,7 +376,8 @@ def load_game_logs(
     use_career_stats=True,
     resume=False,
     active_only=False,
-    start_player=0
+    start_player=0,
+    cache_http=False
 ):
     """Entry point for loading game logs."""
     from config import COOLDOWN_INTERVAL
@@ -459,7 +391,8 @@ def load_game_logs(
         use_career_stats=use_career_stats,
         resume=resume,
         active_only=active_only,
-        start_player=start_player
+        start_player=start_player,
+        cache_http=cache_http
     )
     loader.run()
     return loader
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Shared keep-alive HTTP session for nba_api requests."""
+from threading import Lock
+import requests
+from requests.adapters import HTTPAdapter
+from nba_api.stats.library.http import NBAStatsHTTP
+from config import HTTP_CACHE_NAME, HTTP_CACHE_EXPIRE, HTTP_CACHE_URL_EXPIRE
+
+_session_lock = Lock()
+_pool_size = 0
+_cache_installed = False
+
+
+def install_session(pool_size: int, cache: bool = False):
+    """
+    Size nba_api's stats session so every worker thread reuses a connection.
+
+    nba_api sends all stats requests through one class-level
+    requests.Session; its default adapter keeps only a few connections
+    per host, so extra worker threads would re-handshake TLS. Mounting a
+    larger adapter keeps one warm connection per worker.
+
+    Args:
+        pool_size: Number of concurrent requests to keep connections for
+        cache: Swap in an on-disk response cache (requires requests-cache)
+
+    Returns:
+        The shared requests.Session
+    """
+    global _pool_size
+
+    with _session_lock:
+        if cache:
+            _install_cache()
+
+        session = NBAStatsHTTP.get_session()
+        if pool_size > _pool_size:
+            _mount_adapter(session, pool_size)
+            _pool_size = pool_size
+        return session
+
+
+def reset_session(stale):
+    """
+    Swap in a fresh stats session after a timeout or dropped connection.
+
+    A timed-out request can leave half-closed sockets in the pool that
+    every later request trips over. The replacement keeps the same pool
+    size and cache setting. Only the caller that saw `stale` fail resets
+    it, so concurrent failures on one session don't replace it repeatedly.
+    The old session isn't closed; requests still running on it finish.
+
+    Args:
+        stale: The session the failed request was sent on
+    """
+    with _session_lock:
+        if NBAStatsHTTP.get_session() is not stale:
+            return
+
+        session = _cached_session() if _cache_installed else requests.Session()
+        if _pool_size:
+            _mount_adapter(session, _pool_size)
+        NBAStatsHTTP.set_session(session)
+
+
+def _mount_adapter(session, pool_size: int):
+    """Mount an adapter keeping `pool_size` connections per host on session."""
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def _install_cache():
+    """
+    Replace nba_api's stats session with a SQLite-backed CachedSession.
+
+    Only successful, non-empty responses are cached, so a failed or empty
+    fetch is retried on the next run. Caller holds _session_lock.
+    """
+    global _cache_installed, _pool_size
+
+    if _cache_installed:
+        return
+
+    try:
+        session = _cached_session()
+    except ImportError:
+        print("⚠️  requests-cache not installed - HTTP caching disabled (pip install requests-cache)")
+        return
+
+    NBAStatsHTTP.set_session(session)
+    _cache_installed = True
+    _pool_size = 0  # New session needs its adapter mounted again
+    print(f"ℹ️  HTTP response cache enabled ({HTTP_CACHE_NAME}.sqlite)")
+
+
+def _cached_session():
+    """Build the SQLite-backed CachedSession (raises ImportError without requests-cache)."""
+    import requests_cache
+
+    return requests_cache.CachedSession(
+        HTTP_CACHE_NAME,
+        backend="sqlite",
+        expire_after=HTTP_CACHE_EXPIRE,
+        urls_expire_after=HTTP_CACHE_URL_EXPIRE,
+        allowable_codes=(200,),
+        filter_fn=lambda response: bool(response.content),
+    )
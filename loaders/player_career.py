@@ -1,46 +1,79 @@
 """Load player career stats data."""
-import time
-import math
+from threading import Lock
 import polars as pl
 from nba_api.stats.endpoints import playercareerstats
-from nba_api.stats.static import players
 from loaders.base import BaseLoader
-from db import get_db
-from config import VERBOSE, COOLDOWN_INTERVAL, COOLDOWN_TIME
+from loaders.static_data import get_all_players
+from config import VERBOSE, COOLDOWN_INTERVAL, API_WORKERS, READ_CHUNK_SIZE, EMPTY_CAREER_RECHECK_DAYS
+
+# Column types for SeasonTotalsRegularSeason rows, matching raw_player_career_stats
+CAREER_SCHEMA = {
+    'PLAYER_ID': pl.Int64, 'SEASON_ID': pl.String, 'LEAGUE_ID': pl.String,
+    'TEAM_ID': pl.Int64, 'TEAM_ABBREVIATION': pl.String, 'PLAYER_AGE': pl.Float64,
+    'GP': pl.Int64, 'GS': pl.Int64, 'MIN': pl.Float64,
+    'FGM': pl.Float64, 'FGA': pl.Float64, 'FG_PCT': pl.Float64,
+    'FG3M': pl.Float64, 'FG3A': pl.Float64, 'FG3_PCT': pl.Float64,
+    'FTM': pl.Float64, 'FTA': pl.Float64, 'FT_PCT': pl.Float64,
+    'OREB': pl.Float64, 'DREB': pl.Float64, 'REB': pl.Float64,
+    'AST': pl.Float64, 'STL': pl.Float64, 'BLK': pl.Float64,
+    'TOV': pl.Float64, 'PF': pl.Float64, 'PTS': pl.Float64,
+}
+
+# Stored (key, GP) rows that _filter_changed_rows compares fetched seasons against
+EXISTING_GP_COLUMNS = ['PLAYER_ID', 'SEASON_ID', 'TEAM_ID', 'GP_old']
+EXISTING_GP_SCHEMA = {'PLAYER_ID': pl.Int64, 'SEASON_ID': pl.String, 'TEAM_ID': pl.Int64, 'GP_old': pl.Int64}
 
 
 class PlayerCareerLoader(BaseLoader):
     """Loader for player career stats (season-by-season totals)."""
 
-    def __init__(self, limit_players=None, cooldown_interval=None, resume=False, active_only=False):
+    def __init__(self, limit_players=None, cooldown_interval=None, resume=False, active_only=False,
+                 max_workers=None, cache_http=False):
         super().__init__()
         self.table_name = "raw_player_career_stats"
+        self.empty_table_name = "raw_player_career_empty"  # Players the API had no stats for
+        self.pk_columns = ('PLAYER_ID', 'SEASON_ID', 'TEAM_ID')
         self.limit_players = limit_players
         self.cooldown_interval = cooldown_interval or COOLDOWN_INTERVAL
+        self.max_workers = max_workers or API_WORKERS
         self.resume = resume
         self.active_only = active_only
+        self.cache_http = cache_http
         self._loaded_player_ids = set()
         self._active_player_ids = set()
-        self._existing_gp = {}
-
-    def _get_existing_gp(self) -> dict:
-        """Get existing GP values from database. Returns {(player_id, season_id, team_id): gp}"""
+        self._empty_player_ids = set()
+        self._new_empty_ids = []  # Appended by fetch workers, recorded after the fetch
+        self._existing_gp = pl.DataFrame()
+        self._skipped_unchanged = 0
+        self._stats_lock = Lock()
+
+    def _get_existing_gp(self) -> pl.DataFrame:
+        """Get existing GP values from database as (PLAYER_ID, SEASON_ID, TEAM_ID, GP_old, _exists) rows."""
         try:
-            with get_db() as conn:
-                cursor = conn.cursor()
+            with self._connection() as conn:
+                # Unbuffered cursor: only one chunk of rows is held as Python tuples
+                cursor = conn.cursor(buffered=False)
                 cursor.execute(f"SELECT PLAYER_ID, SEASON_ID, TEAM_ID, GP FROM {self.table_name}")
-                rows = cursor.fetchall()
-                gp_dict = {(row[0], row[1], row[2]): row[3] for row in rows}
-                print(f"✓ Loaded {len(gp_dict)} existing career stat records")
-                return gp_dict
+
+                chunks = []
+                while rows := cursor.fetchmany(READ_CHUNK_SIZE):
+                    chunks.append(self._rows_to_df(rows, EXISTING_GP_COLUMNS, EXISTING_GP_SCHEMA))
+                if not chunks:
+                    print("✓ Loaded 0 existing career stat records")
+                    return pl.DataFrame()
+
+                # _exists marks a stored key, so a stored NULL GP isn't mistaken for a new row
+                existing = pl.concat(chunks).with_columns(pl.lit(True).alias('_exists'))
+                print(f"✓ Loaded {len(existing)} existing career stat records")
+                return existing
         except Exception as e:
             print(f"⚠️  Could not load existing GP values: {e}")
-            return {}
+            return pl.DataFrame()
 
     def _get_loaded_player_ids(self) -> set:
         """Get player IDs already in the database."""
         try:
-            with get_db() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(f"SELECT DISTINCT PLAYER_ID FROM {self.table_name}")
                 rows = cursor.fetchall()
@@ -51,10 +84,46 @@ class PlayerCareerLoader(BaseLoader):
             print(f"⚠️  Could not check existing players: {e}")
             return set()
 
+    def _get_empty_player_ids(self) -> set:
+        """Get player IDs recently found to have no career stats."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT PLAYER_ID FROM {self.empty_table_name} "
+                    "WHERE checked_at >= NOW() - INTERVAL %s DAY",
+                    (EMPTY_CAREER_RECHECK_DAYS,)
+                )
+                empty_ids = {row[0] for row in cursor.fetchall()}
+                print(f"✓ Found {len(empty_ids)} players with no career stats (checked in last {EMPTY_CAREER_RECHECK_DAYS} days)")
+                return empty_ids
+        except Exception as e:
+            print(f"⚠️  Could not check players without career stats: {e}")
+            return set()
+
+    def _record_empty_players(self):
+        """Remember players the API returned no career stats for, so resume runs skip them."""
+        if not self._new_empty_ids:
+            return
+
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    f"INSERT INTO {self.empty_table_name} (PLAYER_ID) VALUES (%s) "
+                    "ON DUPLICATE KEY UPDATE checked_at = CURRENT_TIMESTAMP",
+                    [(player_id,) for player_id in self._new_empty_ids]
+                )
+                conn.commit()
+            if VERBOSE:
+                print(f"✓ Recorded {len(self._new_empty_ids)} players with no career stats")
+        except Exception as e:
+            print(f"⚠️  Could not record players without career stats: {e}")
+
     def _get_active_player_ids(self) -> set:
         """Get active player IDs from raw_players table."""
         try:
-            with get_db() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id FROM raw_players WHERE is_active = 1")
                 rows = cursor.fetchall()
@@ -65,46 +134,14 @@ class PlayerCareerLoader(BaseLoader):
             print(f"⚠️  Could not get active players: {e}")
             return set()
 
-    def _normalize_dataframe(self, df: pl.DataFrame) -> pl.DataFrame:
-        """Normalize DataFrame columns to consistent types."""
-        schema = {
-            'PLAYER_ID': pl.Int64, 'SEASON_ID': pl.String, 'LEAGUE_ID': pl.String,
-            'TEAM_ID': pl.Int64, 'TEAM_ABBREVIATION': pl.String, 'PLAYER_AGE': pl.Float64,
-            'GP': pl.Int64, 'GS': pl.Int64, 'MIN': pl.Float64,
-            'FGM': pl.Float64, 'FGA': pl.Float64, 'FG_PCT': pl.Float64,
-            'FG3M': pl.Float64, 'FG3A': pl.Float64, 'FG3_PCT': pl.Float64,
-            'FTM': pl.Float64, 'FTA': pl.Float64, 'FT_PCT': pl.Float64,
-            'OREB': pl.Float64, 'DREB': pl.Float64, 'REB': pl.Float64,
-            'AST': pl.Float64, 'STL': pl.Float64, 'BLK': pl.Float64,
-            'TOV': pl.Float64, 'PF': pl.Float64, 'PTS': pl.Float64,
-        }
-
-        for col, dtype in schema.items():
-            if col in df.columns:
-                try:
-                    df = df.with_columns(pl.col(col).cast(dtype))
-                except Exception:
-                    df = df.with_columns(pl.col(col).cast(pl.String))
-
-        return df
-
-    def _clean_row_for_mysql(self, row: list) -> list:
-        """Clean a row for MySQL insertion by converting NaN/inf to None."""
-        cleaned = []
-        for val in row:
-            if val is None:
-                cleaned.append(None)
-            elif isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
-                cleaned.append(None)
-            else:
-                cleaned.append(val)
-        return cleaned
-
-    def _fetch_player_career(self, player_id: int, player_name: str) -> pl.DataFrame | None:
+    def _fetch_player_career(self, player_id: int, player_name: str, progress: str = "") -> pl.DataFrame | None:
         """Fetch career stats for a single player."""
         if self.check_shutdown():
             return None
 
+        if VERBOSE:
+            print(f"  {progress} {player_name}...")
+
         try:
             career = self.api_call(
                 playercareerstats.PlayerCareerStats,
@@ -118,24 +155,31 @@ class PlayerCareerLoader(BaseLoader):
                 return None
 
             try:
-                df_pandas = career.get_data_frames()[0]
+                # Build straight from the JSON rowSet; no pandas round-trip
+                result_set = career.get_dict()['resultSets'][0]
             except (KeyError, IndexError):
                 if VERBOSE:
                     print(f"    ⚠️  {player_name}: No career stats available")
+                self._new_empty_ids.append(player_id)
                 return None
 
-            if not df_pandas.empty:
-                df_polars = pl.from_pandas(df_pandas)
-                df_polars = self._normalize_dataframe(df_polars)
-                self._partial_data.append(df_polars)
+            rows = result_set['rowSet']
+            if rows:
+                df_polars = self._rows_to_df(rows, result_set['headers'], CAREER_SCHEMA)
 
                 if VERBOSE:
                     print(f"    ✓ {len(df_polars)} seasons")
 
+                # Filter per player so buffered rows can be flushed as-is
+                df_polars = self._filter_changed_rows(df_polars)
+                if not df_polars.is_empty():
+                    self._append_partial(df_polars)
+
                 return df_polars
             else:
                 if VERBOSE:
                     print(f"    ⚠️  {player_name}: Empty career stats")
+                self._new_empty_ids.append(player_id)
                 return None
 
         except Exception as e:
@@ -150,40 +194,34 @@ class PlayerCareerLoader(BaseLoader):
 
     def _filter_changed_rows(self, df: pl.DataFrame) -> pl.DataFrame:
         """Filter to only rows where GP changed or new records."""
-        if df.is_empty() or not self._existing_gp:
+        if df.is_empty() or self._existing_gp.is_empty():
             return df
 
-        rows_to_keep = []
-        
-        for row in df.iter_rows(named=True):
-            player_id = row.get('PLAYER_ID')
-            season_id = row.get('SEASON_ID')
-            team_id = row.get('TEAM_ID')
-            gp = row.get('GP')
-            
-            key = (player_id, season_id, team_id)
-            
-            if key not in self._existing_gp:
-                rows_to_keep.append(True)
-            elif self._existing_gp[key] != gp:
-                rows_to_keep.append(True)
-            else:
-                rows_to_keep.append(False)
-        
-        filtered = df.filter(pl.Series(rows_to_keep))
-        
-        skipped = len(df) - len(filtered)
-        if skipped > 0:
-            print(f"✓ Skipped {skipped} unchanged records, keeping {len(filtered)} new/updated")
-        
+        # Left join against stored GP (marker column added once at load time)
+        filtered = (
+            df.join(
+                self._existing_gp,
+                on=list(self.pk_columns),
+                how='left',
+                nulls_equal=True,
+                maintain_order='left',
+            )
+            .filter(pl.col('_exists').is_null() | pl.col('GP_old').ne_missing(pl.col('GP')))
+            .drop('GP_old', '_exists')
+        )
+
+        with self._stats_lock:
+            self._skipped_unchanged += len(df) - len(filtered)
+
         return filtered
 
     def fetch_data(self) -> pl.DataFrame:
         """Fetch career stats for all players."""
-        all_players = players.get_players()
+        all_players = get_all_players()
 
         if self.resume:
             self._loaded_player_ids = self._get_loaded_player_ids()
+            self._empty_player_ids = self._get_empty_player_ids()
 
         if self.active_only:
             self._active_player_ids = self._get_active_player_ids()
@@ -201,122 +239,97 @@ class PlayerCareerLoader(BaseLoader):
             print(f"   Resume mode: Will skip players already in database")
         if self.active_only:
             print(f"   Active only: Will only fetch for active players ({len(self._active_player_ids)} players)")
+        print(f"   Parallel workers: {self.max_workers}")
         print(f"   Cool-down: Every {self.cooldown_interval} players")
 
-        all_careers = []
-        player_count = 0
+        fetched_count = 0
         skipped_count = 0
         skipped_inactive = 0
-        fetched_count = 0
-
-        for player in all_players:
-            if self.check_shutdown():
-                print(f"\n⚠️  Shutdown requested - stopping at player {player_count}/{len(all_players)}")
-                break
-
-            player_id = player['id']
-            player_name = player['full_name']
-            player_count += 1
+        skipped_empty = 0
 
-            if self.active_only and player_id not in self._active_player_ids:
-                skipped_inactive += 1
-                continue
+        # Decide who to fetch with set operations, counting skips from set sizes
+        candidates = {player['id'] for player in all_players}
 
-            if self.resume and player_id in self._loaded_player_ids:
-                if VERBOSE:
-                    print(f"  [{player_count}/{len(all_players)}] {player_name} - skipped (already loaded)")
-                skipped_count += 1
-                continue
-
-            if VERBOSE:
-                print(f"  [{player_count}/{len(all_players)}] {player_name}...")
+        if self.active_only:
+            active = candidates & self._active_player_ids
+            skipped_inactive = len(candidates) - len(active)
+            candidates = active
 
+        if self.resume:
+            remaining = candidates - self._loaded_player_ids
+            skipped_count = len(candidates) - len(remaining)
+            candidates = remaining
+
+            remaining = candidates - self._empty_player_ids
+            skipped_empty = len(candidates) - len(remaining)
+            candidates = remaining
+
+        # Keep the player list's order (and position labels) for the fetch queue
+        total = len(all_players)
+        to_fetch = [
+            (player['id'], player['full_name'], f"[{position}/{total}]")
+            for position, player in enumerate(all_players, 1)
+            if player['id'] in candidates
+        ]
+
+        # Results are filtered, buffered (and flushed) via _append_partial
+        for _ in self.fetch_concurrently(
+            self._fetch_player_career, to_fetch, self.max_workers, self.cooldown_interval
+        ):
             fetched_count += 1
-            if fetched_count > 0 and fetched_count % self.cooldown_interval == 0:
-                if VERBOSE:
-                    print(f"   💤 Taking a {COOLDOWN_TIME}s cool-down break after {fetched_count} API calls...")
-                time.sleep(COOLDOWN_TIME)
 
-            df = self._fetch_player_career(player_id, player_name)
-            if df is not None:
-                all_careers.append(df)
+        # The flush thread shares the connection; let it finish first
+        self._wait_for_flushes()
+        self._record_empty_players()
+
+        if self.check_shutdown():
+            print(f"\n⚠️  Shutdown requested - stopped after {fetched_count}/{len(to_fetch)} players")
 
         print(f"\n📊 Summary:")
         print(f"   Total players: {len(all_players)}")
         if self.active_only:
             print(f"   Skipped (inactive): {skipped_inactive}")
         print(f"   Skipped (already loaded): {skipped_count}")
-        print(f"   Fetched this run: {len(all_careers)}")
+        if self.resume:
+            print(f"   Skipped (no career stats): {skipped_empty}")
+        print(f"   Fetched this run: {fetched_count}")
 
-        if not all_careers:
+        if not fetched_count:
             print("⚠️  No new player career stats to load")
             return pl.DataFrame()
 
-        try:
-            combined = pl.concat(all_careers, how="diagonal")
-        except Exception:
-            combined = pl.concat(all_careers, how="diagonal_relaxed")
-
-        print(f"✓ Combined career stats: {len(combined)} player-seasons")
+        # Whatever wasn't flushed during the fetch
+        combined = self._partial_frame()
+        kept = len(combined) + self._flushed_rows
 
-        combined = self._filter_changed_rows(combined)
+        print(f"✓ Combined career stats: {kept + self._skipped_unchanged} player-seasons")
+        if self._skipped_unchanged:
+            print(f"✓ Skipped {self._skipped_unchanged} unchanged records, keeping {kept} new/updated")
 
         return combined
 
-    def insert_data(self, df: pl.DataFrame):
-        """Insert DataFrame into database, handling NaN values."""
-        from db import get_db
-        from config import BATCH_SIZE
+    def create_table(self):
+        """Create the career stats table and its no-stats companion table."""
+        super().create_table()
 
-        if df.is_empty():
-            print(f"⚠️  No data to insert into {self.table_name}")
-            return
-
-        columns = df.columns
-        placeholders = ", ".join(["%s"] * len(columns))
-        cols_str = ", ".join(columns)
-
-        sql = f"REPLACE INTO {self.table_name} ({cols_str}) VALUES ({placeholders})"
-        rows = [self._clean_row_for_mysql(row) for row in df.to_numpy().tolist()]
-
-        total_inserted = 0
-
-        with get_db() as conn:
+        with self._connection() as conn:
             cursor = conn.cursor()
-
-            for i in range(0, len(rows), BATCH_SIZE):
-                if self._shutdown_requested and not self._is_cleaning_up:
-                    print(f"\n⚠️  Shutdown requested - stopping insert")
-                    break
-
-                batch = rows[i:i + BATCH_SIZE]
-
-                try:
-                    cursor.executemany(sql, batch)
-                    total_inserted += len(batch)
-                    if VERBOSE:
-                        print(f"  ✓ Inserted batch: {len(batch)} rows (total: {total_inserted}/{len(rows)})")
-                except Exception as e:
-                    print(f"❌ Batch insert failed: {e}")
-                    for row in batch:
-                        if self._shutdown_requested and not self._is_cleaning_up:
-                            break
-                        try:
-                            cursor.execute(sql, row)
-                            total_inserted += 1
-                        except Exception as row_error:
-                            print(f"⚠️  Failed to insert row: {row_error}")
-
-        print(f"✓ Inserted {total_inserted} rows into {self.table_name}")
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.empty_table_name} (
+                PLAYER_ID INT PRIMARY KEY,
+                checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """)
+            conn.commit()
 
     def get_create_table_sql(self) -> str:
         return f"""
         CREATE TABLE IF NOT EXISTS {self.table_name} (
             PLAYER_ID INT,
-            SEASON_ID VARCHAR(255),
-            LEAGUE_ID VARCHAR(255),
+            SEASON_ID VARCHAR(10),
+            LEAGUE_ID VARCHAR(5),
             TEAM_ID INT,
-            TEAM_ABBREVIATION VARCHAR(255),
+            TEAM_ABBREVIATION VARCHAR(10),
             PLAYER_AGE FLOAT,
             GP INT,
             GS INT,
@@ -348,13 +361,16 @@ class PlayerCareerLoader(BaseLoader):
         """
 
 
-def load_player_career(limit_players=None, cooldown_interval=None, resume=False, active_only=False):
+def load_player_career(limit_players=None, cooldown_interval=None, resume=False, active_only=False,
+                       max_workers=None, cache_http=False):
     """Entry point for loading player career stats."""
     loader = PlayerCareerLoader(
         limit_players=limit_players,
         cooldown_interval=cooldown_interval,
         resume=resume,
-        active_only=active_only
+        active_only=active_only,
+        max_workers=max_workers,
+        cache_http=cache_http
     )
     loader.run()
     return loader
\ No newline at end of file
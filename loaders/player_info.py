@@ -1,17 +1,33 @@
 """Load player common info data."""
-import time
 import polars as pl
 from nba_api.stats.endpoints import commonplayerinfo
-from nba_api.stats.static import players
 from loaders.base import BaseLoader
-from db import get_db
-from config import VERBOSE, COOLDOWN_INTERVAL, COOLDOWN_TIME
+from loaders.static_data import get_all_players
+from config import VERBOSE, COOLDOWN_INTERVAL, API_WORKERS
+
+
+# Column types for CommonPlayerInfo rows, matching raw_player_common_info
+PLAYER_INFO_SCHEMA = {
+    'PERSON_ID': pl.Int64, 'FIRST_NAME': pl.String, 'LAST_NAME': pl.String,
+    'DISPLAY_FIRST_LAST': pl.String, 'DISPLAY_LAST_COMMA_FIRST': pl.String,
+    'DISPLAY_FI_LAST': pl.String, 'PLAYER_SLUG': pl.String, 'BIRTHDATE': pl.String,
+    'SCHOOL': pl.String, 'COUNTRY': pl.String, 'LAST_AFFILIATION': pl.String,
+    'HEIGHT': pl.String, 'WEIGHT': pl.String, 'SEASON_EXP': pl.Int64,
+    'JERSEY': pl.String, 'POSITION': pl.String, 'ROSTERSTATUS': pl.String,
+    'GAMES_PLAYED_CURRENT_SEASON_FLAG': pl.String, 'TEAM_ID': pl.Int64,
+    'TEAM_NAME': pl.String, 'TEAM_ABBREVIATION': pl.String, 'TEAM_CODE': pl.String,
+    'TEAM_CITY': pl.String, 'PLAYERCODE': pl.String, 'FROM_YEAR': pl.Int64,
+    'TO_YEAR': pl.Int64, 'DLEAGUE_FLAG': pl.String, 'NBA_FLAG': pl.String,
+    'GAMES_PLAYED_FLAG': pl.String, 'DRAFT_YEAR': pl.String, 'DRAFT_ROUND': pl.String,
+    'DRAFT_NUMBER': pl.String, 'GREATEST_75_FLAG': pl.String,
+}
 
 
 class PlayerInfoLoader(BaseLoader):
     """Loader for player common info (biographical/roster data)."""
 
-    def __init__(self, limit_players=None, cooldown_interval=None, resume=False, active_only=False):
+    def __init__(self, limit_players=None, cooldown_interval=None, resume=False, active_only=False,
+                 max_workers=None, cache_http=False):
         """
         Initialize player info loader.
 
@@ -20,20 +36,25 @@ class PlayerInfoLoader(BaseLoader):
             cooldown_interval: Take a break after every N players
             resume: Skip players already in database
             active_only: Only fetch for active players
+            max_workers: Concurrent API calls (defaults to API_WORKERS)
+            cache_http: Serve repeat API requests from the on-disk cache
         """
         super().__init__()
         self.table_name = "raw_player_common_info"
+        self.pk_columns = ('PERSON_ID',)
         self.limit_players = limit_players
         self.cooldown_interval = cooldown_interval or COOLDOWN_INTERVAL
+        self.max_workers = max_workers or API_WORKERS
         self.resume = resume
         self.active_only = active_only
+        self.cache_http = cache_http
         self._loaded_player_ids = set()
         self._active_player_ids = set()
 
     def _get_loaded_player_ids(self) -> set:
         """Get player IDs already in the database."""
         try:
-            with get_db() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(f"SELECT PERSON_ID FROM {self.table_name}")
                 rows = cursor.fetchall()
@@ -47,7 +68,7 @@ class PlayerInfoLoader(BaseLoader):
     def _get_active_player_ids(self) -> set:
         """Get active player IDs from raw_players table."""
         try:
-            with get_db() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id FROM raw_players WHERE is_active = 1")
                 rows = cursor.fetchall()
@@ -58,13 +79,14 @@ class PlayerInfoLoader(BaseLoader):
             print(f"⚠️  Could not get active players: {e}")
             return set()
 
-    def _fetch_player_info(self, player_id: int, player_name: str) -> pl.DataFrame | None:
+    def _fetch_player_info(self, player_id: int, player_name: str, progress: str = "") -> pl.DataFrame | None:
         """
         Fetch common info for a single player.
 
         Args:
             player_id: NBA player ID
             player_name: Player's full name (for logging)
+            progress: Position label such as "[12/5000]" (for logging)
 
         Returns:
             Polars DataFrame with player info, or None if no data
@@ -72,6 +94,9 @@ class PlayerInfoLoader(BaseLoader):
         if self.check_shutdown():
             return None
 
+        if VERBOSE:
+            print(f"  {progress} {player_name}...")
+
         try:
             player_info = self.api_call(
                 commonplayerinfo.CommonPlayerInfo,
@@ -84,14 +109,15 @@ class PlayerInfoLoader(BaseLoader):
                     print(f"    ⚠️  {player_name}: No data (API call failed)")
                 return None
 
-            df_pandas = player_info.common_player_info.get_data_frame()
+            # Build straight from the JSON rowSet; no pandas round-trip
+            result_set = player_info.get_dict()['resultSets'][0]
+            rows = result_set['rowSet']
 
-            if not df_pandas.empty:
-                # Convert to polars
-                df_polars = pl.from_pandas(df_pandas)
+            if rows:
+                df_polars = self._rows_to_df(rows, result_set['headers'], PLAYER_INFO_SCHEMA)
 
                 # Store partial data for graceful shutdown
-                self._partial_data.append(df_polars)
+                self._append_partial(df_polars)
 
                 return df_polars
 
@@ -104,7 +130,7 @@ class PlayerInfoLoader(BaseLoader):
     def fetch_data(self) -> pl.DataFrame:
         """Fetch common info for all players."""
         # Get all players
-        all_players = players.get_players()
+        all_players = get_all_players()
 
         # If resuming, get already loaded player IDs
         if self.resume:
@@ -126,50 +152,43 @@ class PlayerInfoLoader(BaseLoader):
             print(f"   Resume mode: Will skip players already in database")
         if self.active_only:
             print(f"   Active only: Will only fetch for active players ({len(self._active_player_ids)} players)")
+        print(f"   Parallel workers: {self.max_workers}")
         print(f"   Cool-down: Every {self.cooldown_interval} players")
 
-        all_info = []
-        player_count = 0
+        fetched_count = 0
         skipped_count = 0
         skipped_inactive = 0
-        fetched_count = 0
-
-        for player in all_players:
-            # Check for shutdown
-            if self.check_shutdown():
-                print(f"\n⚠️  Shutdown requested - stopping at player {player_count}/{len(all_players)}")
-                break
-
-            player_id = player['id']
-            player_name = player['full_name']
-            player_count += 1
-
-            # Skip if active_only and player is not active
-            if self.active_only and player_id not in self._active_player_ids:
-                skipped_inactive += 1
-                continue
 
-            # Skip if resuming and player already loaded
-            if self.resume and player_id in self._loaded_player_ids:
-                if VERBOSE:
-                    print(f"  [{player_count}/{len(all_players)}] {player_name} - skipped (already loaded)")
-                skipped_count += 1
-                continue
+        # Decide who to fetch with set operations, counting skips from set sizes
+        candidates = {player['id'] for player in all_players}
 
-            if VERBOSE:
-                print(f"  [{player_count}/{len(all_players)}] {player_name}...")
+        if self.active_only:
+            active = candidates & self._active_player_ids
+            skipped_inactive = len(candidates) - len(active)
+            candidates = active
 
-            # Cool down period (based on fetched count, not total count)
+        if self.resume:
+            remaining = candidates - self._loaded_player_ids
+            skipped_count = len(candidates) - len(remaining)
+            candidates = remaining
+
+        # Keep the player list's order (and position labels) for the fetch queue
+        total = len(all_players)
+        to_fetch = [
+            (player['id'], player['full_name'], f"[{position}/{total}]")
+            for position, player in enumerate(all_players, 1)
+            if player['id'] in candidates
+        ]
+
+        # Fetch player info concurrently (cool-down based on fetched count, not total count)
+        # Results are buffered (and flushed) via _append_partial
+        for _ in self.fetch_concurrently(
+            self._fetch_player_info, to_fetch, self.max_workers, self.cooldown_interval
+        ):
             fetched_count += 1
-            if fetched_count > 0 and fetched_count % self.cooldown_interval == 0:
-                if VERBOSE:
-                    print(f"   💤 Taking a {COOLDOWN_TIME}s cool-down break after {fetched_count} API calls...")
-                time.sleep(COOLDOWN_TIME)
 
-            # Fetch player info
-            df = self._fetch_player_info(player_id, player_name)
-            if df is not None:
-                all_info.append(df)
+        if self.check_shutdown():
+            print(f"\n⚠️  Shutdown requested - stopped after {fetched_count}/{len(to_fetch)} players")
 
         # Summary
         print(f"\n📊 Summary:")
@@ -177,15 +196,15 @@ class PlayerInfoLoader(BaseLoader):
         if self.active_only:
             print(f"   Skipped (inactive): {skipped_inactive}")
         print(f"   Skipped (already loaded): {skipped_count}")
-        print(f"   Fetched this run: {len(all_info)}")
+        print(f"   Fetched this run: {fetched_count}")
 
-        # Combine all info
-        if not all_info:
+        if not fetched_count:
             print("⚠️  No new player info to load")
             return pl.DataFrame()
 
-        combined = pl.concat(all_info)
-        print(f"✓ Combined info for {len(combined)} players")
+        # Whatever wasn't flushed during the fetch
+        combined = self._partial_frame()
+        print(f"✓ Combined info for {len(combined) + self._flushed_rows} players")
 
         return combined
 
@@ -194,38 +213,38 @@ class PlayerInfoLoader(BaseLoader):
         return f"""
         CREATE TABLE IF NOT EXISTS {self.table_name} (
             PERSON_ID INT PRIMARY KEY,
-            FIRST_NAME VARCHAR(255),
-            LAST_NAME VARCHAR(255),
-            DISPLAY_FIRST_LAST VARCHAR(255),
-            DISPLAY_LAST_COMMA_FIRST VARCHAR(255),
-            DISPLAY_FI_LAST VARCHAR(255),
-            PLAYER_SLUG VARCHAR(255),
-            BIRTHDATE VARCHAR(255),
-            SCHOOL VARCHAR(255),
-            COUNTRY VARCHAR(255),
-            LAST_AFFILIATION VARCHAR(255),
-            HEIGHT VARCHAR(255),
-            WEIGHT VARCHAR(255),
+            FIRST_NAME VARCHAR(100),
+            LAST_NAME VARCHAR(100),
+            DISPLAY_FIRST_LAST VARCHAR(100),
+            DISPLAY_LAST_COMMA_FIRST VARCHAR(100),
+            DISPLAY_FI_LAST VARCHAR(100),
+            PLAYER_SLUG VARCHAR(100),
+            BIRTHDATE VARCHAR(20),
+            SCHOOL VARCHAR(100),
+            COUNTRY VARCHAR(50),
+            LAST_AFFILIATION VARCHAR(100),
+            HEIGHT VARCHAR(10),
+            WEIGHT VARCHAR(10),
             SEASON_EXP INT,
-            JERSEY VARCHAR(255),
-            POSITION VARCHAR(255),
-            ROSTERSTATUS VARCHAR(255),
-            GAMES_PLAYED_CURRENT_SEASON_FLAG VARCHAR(255),
+            JERSEY VARCHAR(10),
+            POSITION VARCHAR(20),
+            ROSTERSTATUS VARCHAR(10),
+            GAMES_PLAYED_CURRENT_SEASON_FLAG VARCHAR(1),
             TEAM_ID INT,
-            TEAM_NAME VARCHAR(255),
-            TEAM_ABBREVIATION VARCHAR(255),
-            TEAM_CODE VARCHAR(255),
-            TEAM_CITY VARCHAR(255),
-            PLAYERCODE VARCHAR(255),
+            TEAM_NAME VARCHAR(50),
+            TEAM_ABBREVIATION VARCHAR(10),
+            TEAM_CODE VARCHAR(50),
+            TEAM_CITY VARCHAR(50),
+            PLAYERCODE VARCHAR(100),
             FROM_YEAR INT,
             TO_YEAR INT,
-            DLEAGUE_FLAG VARCHAR(255),
-            NBA_FLAG VARCHAR(255),
-            GAMES_PLAYED_FLAG VARCHAR(255),
-            DRAFT_YEAR VARCHAR(255),
-            DRAFT_ROUND VARCHAR(255),
-            DRAFT_NUMBER VARCHAR(255),
-            GREATEST_75_FLAG VARCHAR(255),
+            DLEAGUE_FLAG VARCHAR(1),
+            NBA_FLAG VARCHAR(1),
+            GAMES_PLAYED_FLAG VARCHAR(1),
+            DRAFT_YEAR VARCHAR(10),
+            DRAFT_ROUND VARCHAR(10),
+            DRAFT_NUMBER VARCHAR(10),
+            GREATEST_75_FLAG VARCHAR(1),
             loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
             INDEX idx_team (TEAM_ID),
             INDEX idx_country (COUNTRY),
@@ -235,7 +254,8 @@ class PlayerInfoLoader(BaseLoader):
         """
 
 
-def load_player_info(limit_players=None, cooldown_interval=None, resume=False, active_only=False):
+def load_player_info(limit_players=None, cooldown_interval=None, resume=False, active_only=False,
+                     max_workers=None, cache_http=False):
     """
     Entry point for loading player common info.
 
@@ -244,6 +264,8 @@ def load_player_info(limit_players=None, cooldown_interval=None, resume=False, a
         cooldown_interval: Take a break after every N players
         resume: Skip players already in database
         active_only: Only fetch for active players
+        max_workers: Concurrent API calls (defaults to API_WORKERS)
+        cache_http: Serve repeat API requests from the on-disk cache
 
     Returns:
         PlayerInfoLoader instance (for retry logic)
@@ -252,7 +274,9 @@ def load_player_info(limit_players=None, cooldown_interval=None, resume=False, a
         limit_players=limit_players,
         cooldown_interval=cooldown_interval,
         resume=resume,
-        active_only=active_only
+        active_only=active_only,
+        max_workers=max_workers,
+        cache_http=cache_http
     )
     loader.run()
     return loader
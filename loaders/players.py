@@ -1,7 +1,7 @@
 """Load NBA players data."""
 import polars as pl
-from nba_api.stats.static import players
 from loaders.base import BaseLoader
+from loaders.static_data import get_all_players
 
 class PlayersLoader(BaseLoader):
     """Loader for NBA players."""
@@ -9,11 +9,14 @@ class PlayersLoader(BaseLoader):
     def __init__(self):
         super().__init__()
         self.table_name = "raw_players"
+        self.pk_columns = ('id',)
     
     def fetch_data(self) -> pl.DataFrame:
         """Fetch all NBA players from the API."""
-        data = self.api_call(players.get_players)
-        return pl.DataFrame(data)
+        # Static list bundled with nba_api - no HTTP request (and no timeout kwarg)
+        data = get_all_players()
+        columns = list(data[0]) if data else []
+        return self._rows_to_df([tuple(row.values()) for row in data], columns)
     
     def get_create_table_sql(self) -> str:
         """Create raw players table."""
@@ -0,0 +1,60 @@
+"""Thread-safe rate limiting for NBA API calls."""
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by API worker threads.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Each
+    acquire() takes one token, sleeping until one is available, so the
+    aggregate request rate stays capped no matter how many threads call it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            burst: Maximum tokens held (calls allowed back-to-back)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    elapsed = now - self._updated_at
+                    self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                    self._updated_at = now
+
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """
+        Hold back every caller for `seconds` (e.g. a cool-down break).
+
+        Args:
+            seconds: How long to block acquire() from now
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated_at = self._paused_until
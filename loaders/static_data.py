@@ -0,0 +1,25 @@
+"""Memoized copies of nba_api's bundled (static) player and team lists."""
+from functools import lru_cache
+from nba_api.stats.static import players, teams
+
+
+@lru_cache(maxsize=1)
+def get_all_players() -> tuple:
+    """
+    Get nba_api's static player list, built once per process.
+
+    Returns:
+        Tuple of player dicts (a tuple so callers can't mutate the cached list)
+    """
+    return tuple(players.get_players())
+
+
+@lru_cache(maxsize=1)
+def get_all_teams() -> tuple:
+    """
+    Get nba_api's static team list, built once per process.
+
+    Returns:
+        Tuple of team dicts (a tuple so callers can't mutate the cached list)
+    """
+    return tuple(teams.get_teams())
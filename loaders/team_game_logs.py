@@ -1,69 +1,153 @@
 """Load team game logs data."""
-import time
+import os
+from datetime import date
+from pathlib import Path
 import polars as pl
 from nba_api.stats.endpoints import teamgamelog
-from nba_api.stats.static import teams
 from loaders.base import BaseLoader
-from config import START_SEASON, END_SEASON, VERBOSE, COOLDOWN_TIME
+from loaders.static_data import get_all_teams
+from config import START_SEASON, END_SEASON, VERBOSE, API_WORKERS, TEAM_LOG_CACHE_DIR, format_season
+
+
+# Column types for TeamGameLog rows, matching raw_team_game_logs
+TEAM_GAMELOG_SCHEMA = {
+    'Team_ID': pl.Int64, 'Game_ID': pl.String, 'GAME_DATE': pl.String,
+    'MATCHUP': pl.String, 'WL': pl.String, 'W': pl.Int64, 'L': pl.Int64,
+    'W_PCT': pl.Float64, 'MIN': pl.Int64,
+    'FGM': pl.Int64, 'FGA': pl.Int64, 'FG_PCT': pl.Float64,
+    'FG3M': pl.Int64, 'FG3A': pl.Int64, 'FG3_PCT': pl.Float64,
+    'FTM': pl.Int64, 'FTA': pl.Int64, 'FT_PCT': pl.Float64,
+    'OREB': pl.Int64, 'DREB': pl.Int64, 'REB': pl.Int64,
+    'AST': pl.Int64, 'STL': pl.Int64, 'BLK': pl.Int64,
+    'TOV': pl.Int64, 'PF': pl.Int64, 'PTS': pl.Int64,
+}
+
 
 class TeamGameLogsLoader(BaseLoader):
     """Loader for team game logs."""
     
-    def __init__(self, start_season=None, end_season=None):
+    def __init__(self, start_season=None, end_season=None, max_workers=None):
         super().__init__()
         self.table_name = "raw_team_game_logs"
+        self.pk_columns = ('Game_ID', 'Team_ID')
         self.start_season = start_season or START_SEASON
         self.end_season = end_season or END_SEASON
+        self.max_workers = max_workers or API_WORKERS
+
+    @staticmethod
+    def _cache_path(team_id: int, season: str) -> Path | None:
+        """
+        Parquet cache file for a team-season, or None if it may still change.
+
+        Only seasons that started before the current one are cached; the
+        season rolls over in October, as in update_recent.py.
+        """
+        if not TEAM_LOG_CACHE_DIR:
+            return None
+
+        today = date.today()
+        current_start = today.year if today.month >= 10 else today.year - 1
+        if int(season[:4]) >= current_start:
+            return None
+
+        return Path(TEAM_LOG_CACHE_DIR) / f"{team_id}_{season}.parquet"
+
+    @staticmethod
+    def _write_cache(path: Path, df: pl.DataFrame):
+        """Write a team-season to the cache via a temp file so readers never see a partial file."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            df.write_parquet(tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"    ⚠️  Could not cache {path.name}: {e}")
+
+    def _read_cache(self, team_id: int, season: str) -> pl.DataFrame | None:
+        """Cached game log for a finished team-season, or None on a miss."""
+        cache_path = self._cache_path(team_id, season)
+        if cache_path is None or not cache_path.exists():
+            return None
+
+        try:
+            return pl.read_parquet(cache_path)
+        except Exception as e:
+            print(f"    ⚠️  Ignoring unreadable cache {cache_path.name}: {e}")
+            return None
+
+    def _fetch_team_season(self, team_id: int, team_name: str, season: str) -> pl.DataFrame | None:
+        """Fetch one team's game log for one season from the API, caching it when finished."""
+        if self.check_shutdown():
+            return None
+
+        cache_path = self._cache_path(team_id, season)
+
+        try:
+            gamelog = self.api_call(
+                teamgamelog.TeamGameLog,
+                team_id=team_id,
+                season=season,
+                timeout=30
+            )
+
+            if gamelog is None:
+                return None
+
+            # Every frame gets the same declared schema, so they stack as-is
+            result_set = gamelog.get_dict()['resultSets'][0]
+            rows = result_set['rowSet']
+
+            if rows:
+                df_polars = self._rows_to_df(rows, result_set['headers'], TEAM_GAMELOG_SCHEMA)
+
+                if VERBOSE:
+                    print(f"    ✓ {team_name} {season}: {len(df_polars)} games")
+
+                if cache_path is not None:
+                    self._write_cache(cache_path, df_polars)
+
+                return df_polars
+
+        except Exception as e:
+            if VERBOSE:
+                print(f"    ⚠️  {team_name} {season}: Failed ({e})")
+
+        return None
     
     def fetch_data(self) -> pl.DataFrame:
         """Fetch team game logs for all teams."""
-        all_teams = teams.get_teams()
-        seasons = [
-            f"{year}-{str(year + 1)[-2:]}" 
-            for year in range(self.start_season, self.end_season)
-        ]
-        
+        all_teams = get_all_teams()
+        seasons = [format_season(year) for year in range(self.start_season, self.end_season)]
+        total = len(all_teams) * len(seasons)
+
+        # Cache hits are read up front so only real API calls are paced
         all_games = []
-        
+        tasks = []
         for team in all_teams:
-            team_id = team['id']
-            team_name = team['full_name']
-            
-            if VERBOSE:
-                print(f"  Fetching {team_name}...")
-            
             for season in seasons:
-                try:
-                    gamelog = self.api_call(
-                        teamgamelog.TeamGameLog,
-                        team_id=team_id,
-                        season=season,
-                        timeout=30
-                    )
-                    
-                    if gamelog is None:
-                        continue
-                    
-                    df_pandas = gamelog.get_data_frames()[0]
-                    
-                    if not df_pandas.empty:
-                        df_polars = pl.from_pandas(df_pandas)
-                        all_games.append(df_polars)
-                        
-                        if VERBOSE:
-                            print(f"    ✓ {season}: {len(df_polars)} games")
-                
-                except Exception as e:
-                    if VERBOSE:
-                        print(f"    ⚠️  {season}: Failed ({e})")
-            
-            # Cooldown between teams
-            time.sleep(COOLDOWN_TIME)
+                cached = self._read_cache(team['id'], season)
+                if cached is not None:
+                    all_games.append(cached)
+                else:
+                    tasks.append((team['id'], team['full_name'], season))
+
+        print(f"ℹ️  Fetching {total} team-seasons ({len(all_teams)} teams x {len(seasons)} seasons)")
+        print(f"   Cached: {len(all_games)}, to fetch: {len(tasks)}")
+        print(f"   Parallel workers: {self.max_workers}")
+
+        # The old COOLDOWN_TIME break after each team becomes the same
+        # long-run pace spread over every len(seasons) fetches
+        all_games.extend(self.fetch_concurrently(
+            self._fetch_team_season, tasks, self.max_workers, len(seasons)
+        ))
+
+        if self.check_shutdown():
+            print(f"\n⚠️  Shutdown requested - stopped after {len(all_games)}/{total} team-seasons")
         
         if not all_games:
             return pl.DataFrame()
         
-        return pl.concat(all_games)
+        return pl.concat(all_games, how="vertical", rechunk=False)
     
     def get_create_table_sql(self) -> str:
         return f"""
@@ -102,7 +186,7 @@ class TeamGameLogsLoader(BaseLoader):
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
         """
 
-def load_team_game_logs(start_season=None, end_season=None):
+def load_team_game_logs(start_season=None, end_season=None, max_workers=None):
     """Entry point for loading team game logs."""
-    loader = TeamGameLogsLoader(start_season, end_season)
+    loader = TeamGameLogsLoader(start_season, end_season, max_workers)
     loader.run()
\ No newline at end of file
@@ -1,7 +1,7 @@
 """Load NBA teams data."""
 import polars as pl
-from nba_api.stats.static import teams
 from loaders.base import BaseLoader
+from loaders.static_data import get_all_teams
 
 class TeamsLoader(BaseLoader):
     """Loader for NBA teams."""
@@ -9,11 +9,14 @@ class TeamsLoader(BaseLoader):
     def __init__(self):
         super().__init__()
         self.table_name = "raw_teams"
+        self.pk_columns = ('id',)
     
     def fetch_data(self) -> pl.DataFrame:
         """Fetch all NBA teams from the API."""
-        data = self.api_call(teams.get_teams)
-        return pl.DataFrame(data)
+        # Static list bundled with nba_api - no HTTP request (and no timeout kwarg)
+        data = get_all_teams()
+        columns = list(data[0]) if data else []
+        return self._rows_to_df([tuple(row.values()) for row in data], columns)
     
     def get_create_table_sql(self) -> str:
         """Create raw teams table."""
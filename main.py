@@ -2,10 +2,7 @@
 import argparse
 import sys
 from db import create_database, test_connection
-from loaders import (
-    load_teams, load_players, load_game_logs,
-    load_team_game_logs, load_player_info, load_player_career
-)
+import loaders
 from config import START_SEASON, END_SEASON
 
 
@@ -48,7 +45,7 @@ def main(args):
 
     if not args.skip_teams:
         try:
-            load_teams()
+            loaders.load_teams()
         except Exception as e:
             print(f"❌ Failed to load teams: {e}")
             if not args.continue_on_error:
@@ -56,7 +53,7 @@ def main(args):
 
     if not args.skip_players:
         try:
-            load_players()
+            loaders.load_players()
         except Exception as e:
             print(f"❌ Failed to load players: {e}")
             if not args.continue_on_error:
@@ -64,10 +61,11 @@ def main(args):
 
     if not args.skip_player_info:
         try:
-            loader = load_player_info(
+            loader = loaders.load_player_info(
                 limit_players=args.limit_players,
                 resume=args.resume,
-                active_only=args.active_only
+                active_only=args.active_only,
+                cache_http=args.cache_http
             )
             if hasattr(loader, 'failed_attempts') and loader.failed_attempts:
                 loaders_with_failures.append(('player_info', loader))
@@ -78,10 +76,11 @@ def main(args):
 
     if not args.skip_player_career:
         try:
-            loader = load_player_career(
+            loader = loaders.load_player_career(
                 limit_players=args.limit_players,
                 resume=args.resume,
-                active_only=args.active_only
+                active_only=args.active_only,
+                cache_http=args.cache_http
             )
             if hasattr(loader, 'failed_attempts') and loader.failed_attempts:
                 loaders_with_failures.append(('player_career', loader))
@@ -92,14 +91,15 @@ def main(args):
 
     if not args.skip_game_logs:
         try:
-            loader = load_game_logs(
+            loader = loaders.load_game_logs(
                 start_season=args.start_season,
                 end_season=args.end_season,
                 limit_players=args.limit_players,
                 use_career_stats=not args.no_career_stats,
                 resume=args.resume,
                 active_only=args.active_only,
-                start_player=args.start_player
+                start_player=args.start_player,
+                cache_http=args.cache_http
             )
             if hasattr(loader, 'failed_attempts') and loader.failed_attempts:
                 loaders_with_failures.append(('game_logs', loader))
@@ -110,7 +110,7 @@ def main(args):
 
     if not args.skip_team_logs:
         try:
-            load_team_game_logs(
+            loaders.load_team_game_logs(
                 start_season=args.start_season,
                 end_season=args.end_season
             )
@@ -142,6 +142,7 @@ if __name__ == "__main__":
     parser.add_argument('--skip-game-logs', action='store_true')
     parser.add_argument('--skip-team-logs', action='store_true')
     parser.add_argument('--no-career-stats', action='store_true', help='Do not use career stats optimization')
+    parser.add_argument('--cache-http', action='store_true', help='Cache player API responses on disk (requests-cache)')
     parser.add_argument('--continue-on-error', action='store_true')
     parser.add_argument('--retry-failures', action='store_true')
 
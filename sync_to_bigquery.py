@@ -4,8 +4,11 @@ Sync MySQL tables to BigQuery.
 Run this after update_recent.py to keep BigQuery in sync with MySQL.
 """
 import os
-from datetime import datetime, date
-from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import BytesIO
+from urllib.parse import quote
+
+import polars as pl
 from google.cloud import bigquery
 from google.oauth2 import service_account
 import mysql.connector
@@ -41,35 +44,71 @@ def get_mysql_connection():
     return mysql.connector.connect(**MYSQL_CONFIG)
 
 
+def get_mysql_uri():
+    """Build a connectorx URI from MYSQL_CONFIG (credentials URL-escaped)."""
+    user = quote(MYSQL_CONFIG["user"], safe="")
+    password = quote(MYSQL_CONFIG["password"], safe="")
+    return f"mysql://{user}:{password}@{MYSQL_CONFIG['host']}/{MYSQL_CONFIG['database']}"
+
+
 def get_bq_client():
     credentials = service_account.Credentials.from_service_account_file(BQ_KEYFILE)
     return bigquery.Client(credentials=credentials, project=BQ_PROJECT)
 
 
-def serialize_row(row):
-    """Convert datetime and other non-JSON types to strings."""
-    serialized = {}
-    for key, value in row.items():
-        if isinstance(value, (datetime, date)):
-            serialized[key] = value.isoformat()
-        elif isinstance(value, Decimal):
-            serialized[key] = float(value)
-        elif isinstance(value, bytes):
-            serialized[key] = value.decode('utf-8', errors='ignore')
-        else:
-            serialized[key] = value
-    return serialized
+def get_table_data(table_name) -> pl.DataFrame:
+    """
+    Fetch all data from a MySQL table as a Polars DataFrame.
+
+    Uses connectorx when installed, which decodes the result set straight
+    into Arrow columns; otherwise falls back to a mysql.connector cursor.
+    """
+    try:
+        import connectorx as cx
+    except ImportError:
+        return _read_with_cursor(table_name)
 
+    table = cx.read_sql(get_mysql_uri(), f"SELECT * FROM {table_name}", return_type="arrow")
+    return pl.from_arrow(table)
 
-def get_table_data(table_name):
-    """Fetch all data from a MySQL table."""
+
+def _read_with_cursor(table_name) -> pl.DataFrame:
+    """Fetch a table through mysql.connector (used when connectorx is missing)."""
     conn = get_mysql_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = conn.cursor()
     cursor.execute(f"SELECT * FROM {table_name}")
+    columns = [desc[0] for desc in cursor.description]
     rows = cursor.fetchall()
     cursor.close()
     conn.close()
-    return [serialize_row(row) for row in rows]
+    return pl.DataFrame(rows, schema=columns, orient="row", infer_schema_length=None)
+
+
+def normalize_types(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Cast columns BigQuery should not see as-is, one whole column at a time.
+
+    DECIMAL becomes FLOAT64 and binary strings become UTF-8 text, dropping
+    invalid bytes as the old per-row serializer did. Naive datetimes are
+    marked as UTC: Parquet stores them as local time, which BigQuery loads
+    as DATETIME, whereas the old ISO strings were read as UTC TIMESTAMPs.
+    """
+    return df.with_columns(
+        pl.col(pl.Decimal).cast(pl.Float64),
+        # A plain cast raises on invalid UTF-8
+        pl.col(pl.Binary).map_elements(
+            lambda value: value.decode('utf-8', errors='ignore'), return_dtype=pl.String
+        ),
+        pl.col(pl.Datetime(time_zone=None)).dt.replace_time_zone("UTC"),
+    )
+
+
+def to_parquet_buffer(df: pl.DataFrame) -> BytesIO:
+    """Write a DataFrame to an in-memory Parquet file, rewound for reading."""
+    buf = BytesIO()
+    df.write_parquet(buf, compression="zstd")
+    buf.seek(0)
+    return buf
 
 
 def sync_table(bq_client, table_name):
@@ -77,9 +116,9 @@ def sync_table(bq_client, table_name):
     print(f"  Syncing {table_name}...")
     
     # Get data from MySQL
-    rows = get_table_data(table_name)
+    df = normalize_types(get_table_data(table_name))
     
-    if not rows:
+    if df.is_empty():
         print(f"    ⚠️  No data in {table_name}")
         return 0
     
@@ -87,17 +126,18 @@ def sync_table(bq_client, table_name):
     table_ref = f"{BQ_PROJECT}.{BQ_DATASET}.{table_name}"
     
     # Configure load job (replace entire table)
+    # Parquet carries its own schema, so no autodetect is needed
     job_config = bigquery.LoadJobConfig(
-        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
-        autodetect=True
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
     )
     
     # Load data
-    job = bq_client.load_table_from_json(rows, table_ref, job_config=job_config)
+    job = bq_client.load_table_from_file(to_parquet_buffer(df), table_ref, job_config=job_config)
     job.result()  # Wait for job to complete
     
-    print(f"    ✓ Loaded {len(rows)} rows")
-    return len(rows)
+    print(f"    ✓ {table_name}: loaded {len(df)} rows")
+    return len(df)
 
 
 def sync_all():
@@ -113,12 +153,15 @@ def sync_all():
     bq_client = get_bq_client()
     total_rows = 0
     
-    for table in TABLES:
-        try:
-            rows = sync_table(bq_client, table)
-            total_rows += rows
-        except Exception as e:
-            print(f"    ❌ Failed: {e}")
+    # Each table's read, upload and load job is independent I/O, so run
+    # them side by side (the BigQuery client is thread-safe)
+    with ThreadPoolExecutor(max_workers=len(TABLES)) as executor:
+        futures = {executor.submit(sync_table, bq_client, table): table for table in TABLES}
+        for future in as_completed(futures):
+            try:
+                total_rows += future.result()
+            except Exception as e:
+                print(f"    ❌ {futures[future]}: Failed: {e}")
     
     print(f"\n{'='*60}")
     print(f"  SYNC COMPLETE — {total_rows} total rows")
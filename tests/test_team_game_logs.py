@@ -0,0 +1,64 @@
+"""Tests for the team game log Parquet cache."""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import polars as pl
+
+from loaders import team_game_logs
+from loaders.rate_limiter import TokenBucket
+from loaders.team_game_logs import TeamGameLogsLoader
+
+
+TEAMS = [
+    {'id': 1610612737, 'full_name': 'Atlanta Hawks'},
+    {'id': 1610612738, 'full_name': 'Boston Celtics'},
+    {'id': 1610612739, 'full_name': 'Cleveland Cavaliers'},
+]
+
+
+class TeamGameLogsCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        cache_dir = Path(self._tmp.name)
+
+        patches = [
+            mock.patch.object(team_game_logs, 'TEAM_LOG_CACHE_DIR', str(cache_dir)),
+            mock.patch.object(team_game_logs, 'get_all_teams', return_value=TEAMS),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.loader = TeamGameLogsLoader(start_season=2020, end_season=2022, max_workers=2)
+
+        for team in TEAMS:
+            for season in ('2020-21', '2021-22'):
+                df = pl.DataFrame({'Team_ID': [team['id']], 'Game_ID': [f"{team['id']}{season}"]})
+                df.write_parquet(cache_dir / f"{team['id']}_{season}.parquet")
+
+    def test_all_hit_run_makes_no_paced_calls(self):
+        with mock.patch.object(TokenBucket, 'acquire') as acquire, \
+                mock.patch.object(TeamGameLogsLoader, 'api_call') as api_call:
+            df = self.loader.fetch_data()
+
+        self.assertEqual(len(df), len(TEAMS) * 2)
+        acquire.assert_not_called()
+        api_call.assert_not_called()
+
+    def test_only_misses_are_fetched(self):
+        (Path(self._tmp.name) / f"{TEAMS[0]['id']}_2021-22.parquet").unlink()
+
+        with mock.patch.object(TokenBucket, 'acquire') as acquire, \
+                mock.patch.object(TeamGameLogsLoader, 'api_call', return_value=None) as api_call:
+            df = self.loader.fetch_data()
+
+        self.assertEqual(len(df), len(TEAMS) * 2 - 1)
+        self.assertEqual(acquire.call_count, 1)
+        api_call.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
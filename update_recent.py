@@ -14,11 +14,14 @@ Designed to run automatically without timing out:
 import os
 import json
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from db import test_connection, get_db
-from config import VERBOSE
+from config import VERBOSE, format_season
+from loaders.rate_limiter import TokenBucket
 
 
 # Progress file for auto-resume
@@ -26,13 +29,56 @@ PROGRESS_FILE = Path(__file__).parent / ".update_progress.json"
 
 # Conservative API settings to avoid timeouts
 BATCH_SIZE = 20              # Players per batch
-DELAY_BETWEEN_PLAYERS = 3    # Seconds between each player
+DELAY_BETWEEN_PLAYERS = 3    # Seconds between API calls (shared by all workers)
+WORKERS = 4                  # Players fetched concurrently within a batch
 DELAY_BETWEEN_BATCHES = 60   # Seconds between batches (1 minute break)
 
 # Timeout recovery settings
 MAX_CONSECUTIVE_TIMEOUTS = 3  # After this many timeouts in a row, pause
 TIMEOUT_RECOVERY_DELAY = 120  # Seconds to wait before retrying (2 minutes)
 
+# Paces API calls across worker threads; latency overlaps instead of adding up
+rate_limiter = TokenBucket(rate=1 / DELAY_BETWEEN_PLAYERS)
+
+# API columns in the order each upsert lists them
+PLAYER_GAME_LOG_COLUMNS = [
+    'SEASON_ID', 'Player_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS', 'VIDEO_AVAILABLE',
+]
+PLAYER_CAREER_COLUMNS = [
+    'PLAYER_ID', 'SEASON_ID', 'LEAGUE_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'PLAYER_AGE',
+    'GP', 'GS', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS',
+]
+TEAM_GAME_LOG_COLUMNS = [
+    'Team_ID', 'Game_ID', 'GAME_DATE', 'MATCHUP', 'WL', 'W', 'L', 'W_PCT', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS',
+]
+
+
+def upsert_sql(table: str, columns: list, key_columns: tuple) -> str:
+    """
+    Build an INSERT ... ON DUPLICATE KEY UPDATE for one row of `columns`.
+
+    executemany() rewrites it into a single multi-row INSERT (the connector
+    only batches INSERT, not REPLACE), and existing rows are updated in
+    place instead of deleted and re-inserted. VALUES() keeps MariaDB support.
+    """
+    placeholders = ", ".join(["%s"] * len(columns))
+    updates = ", ".join(f"{c}=VALUES({c})" for c in columns if c not in key_columns)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON DUPLICATE KEY UPDATE {updates}"
+    )
+
+
+# Built once so every write reuses the same statement text
+PLAYER_GAME_LOG_SQL = upsert_sql('raw_player_game_logs', PLAYER_GAME_LOG_COLUMNS, ('Game_ID', 'Player_ID'))
+PLAYER_CAREER_SQL = upsert_sql('raw_player_career_stats', PLAYER_CAREER_COLUMNS, ('PLAYER_ID', 'SEASON_ID', 'TEAM_ID'))
+TEAM_GAME_LOG_SQL = upsert_sql('raw_team_game_logs', TEAM_GAME_LOG_COLUMNS, ('Game_ID', 'Team_ID'))
+
 
 def get_current_season() -> tuple[int, str]:
     now = datetime.now()
@@ -40,8 +86,7 @@ def get_current_season() -> tuple[int, str]:
         season_year = now.year - 1
     else:
         season_year = now.year
-    season_string = f"{season_year}-{str(season_year + 1)[-2:]}"
-    return season_year, season_string
+    return season_year, format_season(season_year)
 
 
 def load_progress() -> dict:
@@ -56,9 +101,11 @@ def load_progress() -> dict:
 
 
 def save_progress(data: dict):
-    """Save progress to file."""
-    with open(PROGRESS_FILE, 'w') as f:
+    """Save progress to file (via a temp file, so a crash never leaves it half-written)."""
+    tmp_file = PROGRESS_FILE.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
         json.dump(data, f)
+    os.replace(tmp_file, PROGRESS_FILE)
 
 
 def clear_progress():
@@ -85,116 +132,58 @@ def is_timeout_error(error: Exception) -> bool:
     return any(word in error_str for word in ['timeout', 'timed out', 'connection', 'read operation'])
 
 
-def fetch_player_game_logs(player_id: int, season: str) -> tuple[int, bool]:
+def result_rows(endpoint, columns: list) -> list:
     """
-    Fetch game logs for a single player.
-    Returns (number of games loaded, was_timeout).
+    Pull an endpoint's first result set as tuples in SQL column order.
+
+    Reads the raw JSON rowSet instead of building a pandas DataFrame;
+    JSON nulls are already None and numbers are plain Python scalars.
+    """
+    result_set = endpoint.get_dict()['resultSets'][0]
+    headers = result_set['headers']
+    idx = [headers.index(col) for col in columns]
+    return [tuple(row[i] for i in idx) for row in result_set['rowSet']]
+
+
+def fetch_rows(endpoint_cls, columns: list, **params) -> tuple[list, bool]:
+    """
+    Call one nba_api endpoint (rate limited) and pull its first result set.
+    Returns (rows in SQL column order, was_timeout).
     """
-    from nba_api.stats.endpoints import playergamelog
-    
     try:
-        time.sleep(DELAY_BETWEEN_PLAYERS)
-        
-        gamelog = playergamelog.PlayerGameLog(
-            player_id=player_id,
-            season=season,
-            timeout=30
-        )
-        
-        df = gamelog.get_data_frames()[0]
-        
-        if df.empty:
-            return 0, False
-        
-        # Insert into database
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            for _, row in df.iterrows():
-                sql = """
-                    REPLACE INTO raw_player_game_logs 
-                    (SEASON_ID, Player_ID, Game_ID, GAME_DATE, MATCHUP, WL, MIN,
-                     FGM, FGA, FG_PCT, FG3M, FG3A, FG3_PCT, FTM, FTA, FT_PCT,
-                     OREB, DREB, REB, AST, STL, BLK, TOV, PF, PTS, PLUS_MINUS, VIDEO_AVAILABLE)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(sql, (
-                    row.get('SEASON_ID'), row.get('Player_ID'), row.get('Game_ID'),
-                    row.get('GAME_DATE'), row.get('MATCHUP'), row.get('WL'), row.get('MIN'),
-                    row.get('FGM'), row.get('FGA'), row.get('FG_PCT'),
-                    row.get('FG3M'), row.get('FG3A'), row.get('FG3_PCT'),
-                    row.get('FTM'), row.get('FTA'), row.get('FT_PCT'),
-                    row.get('OREB'), row.get('DREB'), row.get('REB'),
-                    row.get('AST'), row.get('STL'), row.get('BLK'),
-                    row.get('TOV'), row.get('PF'), row.get('PTS'),
-                    row.get('PLUS_MINUS'), row.get('VIDEO_AVAILABLE')
-                ))
-        
-        return len(df), False
+        rate_limiter.acquire()
+        endpoint = endpoint_cls(timeout=30, **params)
+        return result_rows(endpoint, columns), False
         
     except Exception as e:
         if VERBOSE:
             print(f"⚠️  Error: {e}")
-        return 0, is_timeout_error(e)
+        return [], is_timeout_error(e)
 
 
-def fetch_player_career(player_id: int, season: str) -> tuple[int, bool]:
+def fetch_player_game_logs(player_id: int, season: str) -> tuple[list, bool]:
+    """
+    Fetch game logs for a single player.
+    Returns (rows in SQL column order, was_timeout).
+    """
+    from nba_api.stats.endpoints import playergamelog
+    
+    return fetch_rows(playergamelog.PlayerGameLog, PLAYER_GAME_LOG_COLUMNS, player_id=player_id, season=season)
+
+
+def fetch_player_career(player_id: int, season: str) -> tuple[list, bool]:
     """
     Fetch career stats for a single player for current season only.
-    Returns (number of records loaded, was_timeout).
+    Returns (rows in SQL column order, was_timeout).
     """
     from nba_api.stats.endpoints import playercareerstats
     
-    try:
-        time.sleep(DELAY_BETWEEN_PLAYERS)
-        
-        career = playercareerstats.PlayerCareerStats(
-            player_id=player_id,
-            timeout=30
-        )
-        
-        df = career.get_data_frames()[0]
-        
-        if df.empty:
-            return 0, False
-        
-        # Filter to current season only
-        season_id = f"2{season.split('-')[0]}"  # e.g., "2024-25" -> "22024"
-        df = df[df['SEASON_ID'] == season_id]
-        
-        if df.empty:
-            return 0, False
-        
-        # Insert into database
-        with get_db() as conn:
-            cursor = conn.cursor()
-            
-            for _, row in df.iterrows():
-                sql = """
-                    REPLACE INTO raw_player_career_stats
-                    (PLAYER_ID, SEASON_ID, LEAGUE_ID, TEAM_ID, TEAM_ABBREVIATION, PLAYER_AGE,
-                     GP, GS, MIN, FGM, FGA, FG_PCT, FG3M, FG3A, FG3_PCT, FTM, FTA, FT_PCT,
-                     OREB, DREB, REB, AST, STL, BLK, TOV, PF, PTS)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(sql, (
-                    row.get('PLAYER_ID'), row.get('SEASON_ID'), row.get('LEAGUE_ID'),
-                    row.get('TEAM_ID'), row.get('TEAM_ABBREVIATION'), row.get('PLAYER_AGE'),
-                    row.get('GP'), row.get('GS'), row.get('MIN'),
-                    row.get('FGM'), row.get('FGA'), row.get('FG_PCT'),
-                    row.get('FG3M'), row.get('FG3A'), row.get('FG3_PCT'),
-                    row.get('FTM'), row.get('FTA'), row.get('FT_PCT'),
-                    row.get('OREB'), row.get('DREB'), row.get('REB'),
-                    row.get('AST'), row.get('STL'), row.get('BLK'),
-                    row.get('TOV'), row.get('PF'), row.get('PTS')
-                ))
-        
-        return len(df), False
-        
-    except Exception as e:
-        if VERBOSE:
-            print(f"⚠️  Error: {e}")
-        return 0, is_timeout_error(e)
+    rows, was_timeout = fetch_rows(playercareerstats.PlayerCareerStats, PLAYER_CAREER_COLUMNS, player_id=player_id)
+    
+    # Filter to current season only
+    season_id = f"2{season.split('-')[0]}"  # e.g., "2024-25" -> "22024"
+    season_idx = PLAYER_CAREER_COLUMNS.index('SEASON_ID')
+    return [row for row in rows if row[season_idx] == season_id], was_timeout
 
 
 def get_team_ids() -> list:
@@ -209,61 +198,78 @@ def get_team_ids() -> list:
         return []
 
 
-def fetch_team_game_logs(team_id: int, season: str) -> tuple[int, bool]:
+def fetch_team_game_logs(team_id: int, season: str) -> tuple[list, bool]:
     """
     Fetch game logs for a single team.
-    Returns (number of games loaded, was_timeout).
+    Returns (rows in SQL column order, was_timeout).
     """
     from nba_api.stats.endpoints import teamgamelog
     
+    return fetch_rows(teamgamelog.TeamGameLog, TEAM_GAME_LOG_COLUMNS, team_id=team_id, season=season)
+
+
+def get_players_with_new_games(season: str) -> set | None:
+    """
+    Find players with more games this season than are stored.
+
+    One LeagueGameLog request returns every player's game for the season;
+    its per-player counts are compared with raw_player_game_logs, so
+    players who haven't played since the last run need no API calls.
+    Returns None if the check fails, meaning every player is updated.
+    """
+    from nba_api.stats.endpoints import leaguegamelog
+    
+    season_id = f"2{season.split('-')[0]}"  # e.g., "2024-25" -> "22024"
+    
     try:
-        time.sleep(DELAY_BETWEEN_PLAYERS)
+        rate_limiter.acquire()
         
-        gamelog = teamgamelog.TeamGameLog(
-            team_id=team_id,
+        league_log = leaguegamelog.LeagueGameLog(
             season=season,
-            timeout=30
+            player_or_team_abbreviation='P',
+            timeout=60
         )
+        api_counts = Counter(row[0] for row in result_rows(league_log, ['PLAYER_ID']))
         
-        df = gamelog.get_data_frames()[0]
-        
-        if df.empty:
-            return 0, False
-        
-        # Insert into database
         with get_db() as conn:
             cursor = conn.cursor()
-            
-            for _, row in df.iterrows():
-                sql = """
-                    REPLACE INTO raw_team_game_logs 
-                    (Team_ID, Game_ID, GAME_DATE, MATCHUP, WL, W, L, W_PCT, MIN,
-                     FGM, FGA, FG_PCT, FG3M, FG3A, FG3_PCT, FTM, FTA, FT_PCT,
-                     OREB, DREB, REB, AST, STL, BLK, TOV, PF, PTS)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(sql, (
-                    row['Team_ID'], row['Game_ID'], row['GAME_DATE'],
-                    row['MATCHUP'], row['WL'], row['W'], row['L'],
-                    row['W_PCT'], row['MIN'],
-                    row['FGM'], row['FGA'], row['FG_PCT'],
-                    row['FG3M'], row['FG3A'], row['FG3_PCT'],
-                    row['FTM'], row['FTA'], row['FT_PCT'],
-                    row['OREB'], row['DREB'], row['REB'],
-                    row['AST'], row['STL'], row['BLK'],
-                    row['TOV'], row['PF'], row['PTS']
-                ))
-        
-        return len(df), False
-        
+            cursor.execute(
+                "SELECT Player_ID, COUNT(*) FROM raw_player_game_logs "
+                "WHERE SEASON_ID = %s GROUP BY Player_ID",
+                (season_id,)
+            )
+            stored_counts = dict(cursor.fetchall())
     except Exception as e:
-        print(f"❌ Database error: {e}")
-        if VERBOSE:
-            print(f"⚠️  Error: {e}")
-        return 0, is_timeout_error(e)
+        print(f"⚠️  Could not check for new games ({e}) - updating every player")
+        return None
+    
+    return {
+        player_id for player_id, games in api_counts.items()
+        if games > stored_counts.get(player_id, 0)
+    }
 
 
-def main(skip_career=False, resume=True):
+def update_player(player_id: int, season: str, skip_career: bool) -> tuple[list, list, bool]:
+    """
+    Fetch career stats (unless skipped) and game logs for one player.
+    Returns (game log rows, career rows, had a timeout).
+    """
+    career_rows, career_timeout = [], False
+    if not skip_career:
+        career_rows, career_timeout = fetch_player_career(player_id, season)
+
+    game_rows, games_timeout = fetch_player_game_logs(player_id, season)
+    return game_rows, career_rows, career_timeout or games_timeout
+
+
+def write_rows(cursor, sql: str, rows: list) -> int:
+    """Insert rows with a single executemany; returns the row count."""
+    if rows:
+        cursor.executemany(sql, rows)
+    return len(rows)
+
+
+def main(skip_career=False, resume=True, all_players=False):
     season_year, season_string = get_current_season()
     
     print(f"\n{'='*70}")
@@ -286,6 +292,12 @@ def main(skip_career=False, resume=True):
     
     print(f"📋 Found {len(player_ids)} active players")
     
+    # Players without new games are skipped (kept in the list so resume indexes stay stable)
+    to_update = None if all_players else get_players_with_new_games(season_string)
+    if to_update is not None:
+        pending = sum(1 for player_id in player_ids if player_id in to_update)
+        print(f"🆕 {pending} players have new games since the last update")
+    
     # Load progress
     progress = load_progress() if resume else {}
     
@@ -297,7 +309,7 @@ def main(skip_career=False, resume=True):
         start_idx = 0
         progress = {'season': season_string, 'last_completed_idx': -1}
     
-    print(f"⚙️  Settings: {BATCH_SIZE} players/batch, {DELAY_BETWEEN_PLAYERS}s delay, {TIMEOUT_RECOVERY_DELAY}s recovery")
+    print(f"⚙️  Settings: {BATCH_SIZE} players/batch, {WORKERS} workers, {DELAY_BETWEEN_PLAYERS}s between calls, {TIMEOUT_RECOVERY_DELAY}s recovery")
     print()
     
     # Process players
@@ -306,99 +318,171 @@ def main(skip_career=False, resume=True):
     consecutive_timeouts = 0
     first_timeout_idx = None  # Track where timeouts started
     
-    i = start_idx
-    while i < len(player_ids):
-        player_id = player_ids[i]
-        batch_num = i // BATCH_SIZE + 1
-        
-        # Batch break
-        if i > start_idx and i % BATCH_SIZE == 0:
-            print(f"\n💤 Batch {batch_num - 1} complete. Taking {DELAY_BETWEEN_BATCHES}s break...\n")
-            time.sleep(DELAY_BETWEEN_BATCHES)
-            consecutive_timeouts = 0  # Reset after batch break
-        
-        print(f"[{i + 1}/{len(player_ids)}] Player {player_id}...", end=" ", flush=True)
+    # Workers only call the API; all writes go through one connection,
+    # committed once per batch rather than once per player
+    with get_db() as conn:
+        cursor = conn.cursor()
         
+        # Each batch is fetched concurrently, then its results are handled in
+        # player order so progress and timeout tracking work as before
+        executor = ThreadPoolExecutor(max_workers=WORKERS)
         try:
-            had_timeout = False
-            
-            # Fetch career stats (current season only)
-            if not skip_career:
-                careers, career_timeout = fetch_player_career(player_id, season_string)
-                total_careers += careers
-                had_timeout = had_timeout or career_timeout
-            
-            # Fetch game logs
-            games, games_timeout = fetch_player_game_logs(player_id, season_string)
-            total_games += games
-            had_timeout = had_timeout or games_timeout
-            
-            # Handle timeout tracking
-            if had_timeout:
-                if consecutive_timeouts == 0:
-                    first_timeout_idx = i  # Remember where timeouts started
-                consecutive_timeouts += 1
-                print(f"⚠️  timeout ({consecutive_timeouts}/{MAX_CONSECUTIVE_TIMEOUTS})")
+            i = start_idx
+            done_idx = progress['last_completed_idx']  # Handled but not yet committed
+            pending_games = pending_careers = 0  # Written but not yet committed
+            batch_called_api = False
+            while i < len(player_ids):
+                batch_num = i // BATCH_SIZE + 1
+                
+                # Batch break (not needed if the last batch was all skips)
+                if i > start_idx and i % BATCH_SIZE == 0 and batch_called_api:
+                    print(f"\n💤 Batch {batch_num - 1} complete. Taking {DELAY_BETWEEN_BATCHES}s break...\n")
+                    time.sleep(DELAY_BETWEEN_BATCHES)
+                    consecutive_timeouts = 0  # Reset after batch break
                 
-                if consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
-                    print(f"\n🛑 {MAX_CONSECUTIVE_TIMEOUTS} consecutive timeouts detected!")
-                    print(f"   Pausing for {TIMEOUT_RECOVERY_DELAY} seconds to recover...")
-                    print(f"   Progress saved. Will resume from player {first_timeout_idx + 1} (first timeout).\n")
+                batch_end = min(batch_num * BATCH_SIZE, len(player_ids))
+                futures = [
+                    executor.submit(update_player, player_ids[idx], season_string, skip_career)
+                    if to_update is None or player_ids[idx] in to_update else None
+                    for idx in range(i, batch_end)
+                ]
+                batch_called_api = any(future is not None for future in futures)
+                
+                for idx, future in zip(range(i, batch_end), futures):
+                    print(f"[{idx + 1}/{len(player_ids)}] Player {player_ids[idx]}...", end=" ", flush=True)
                     
-                    # Save progress at the FIRST timeout, not current
-                    progress['last_completed_idx'] = first_timeout_idx - 1
-                    save_progress(progress)
-                    time.sleep(TIMEOUT_RECOVERY_DELAY)
+                    if future is None:
+                        print("⏭️  no new games")
+                        done_idx = idx
+                        continue
+                    
+                    try:
+                        game_rows, career_rows, had_timeout = future.result()
+                    except Exception as e:
+                        print(f"❌ Failed: {e}")
+                        done_idx = idx  # Move to next player
+                        continue
+                    
+                    try:
+                        cursor.execute("SAVEPOINT player")
+                        games = write_rows(cursor, PLAYER_GAME_LOG_SQL, game_rows)
+                        careers = write_rows(cursor, PLAYER_CAREER_SQL, career_rows)
+                    except Exception as e:
+                        print(f"❌ Failed: {e}")
+                        try:
+                            # Undo just this player; the batch so far stays pending
+                            cursor.execute("ROLLBACK TO SAVEPOINT player")
+                        except Exception:
+                            # Deadlocks (and lost connections) roll back the whole
+                            # transaction, so redo the batch from the last commit
+                            conn.rollback()
+                            pending_games = pending_careers = 0
+                            for pending in futures:
+                                if pending is not None:
+                                    pending.cancel()
+                            print(f"🔄 Batch rolled back - redoing from player {progress['last_completed_idx'] + 2}\n")
+                            break
+                        done_idx = idx  # Move to next player
+                        continue
                     
-                    # Reset and go back to first timeout
-                    consecutive_timeouts = 0
+                    pending_games += games
+                    pending_careers += careers
+                    
+                    # Handle timeout tracking
+                    if had_timeout:
+                        if consecutive_timeouts == 0:
+                            first_timeout_idx = idx  # Remember where timeouts started
+                        consecutive_timeouts += 1
+                        print(f"⚠️  timeout ({consecutive_timeouts}/{MAX_CONSECUTIVE_TIMEOUTS})")
+                        
+                        if consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS:
+                            print(f"\n🛑 {MAX_CONSECUTIVE_TIMEOUTS} consecutive timeouts detected!")
+                            print(f"   Pausing for {TIMEOUT_RECOVERY_DELAY} seconds to recover...")
+                            print(f"   Progress saved. Will resume from player {first_timeout_idx + 1} (first timeout).\n")
+                            
+                            for pending in futures:
+                                if pending is not None:
+                                    pending.cancel()
+                            
+                            # Save progress at the FIRST timeout, not current
+                            conn.commit()
+                            total_games += pending_games
+                            total_careers += pending_careers
+                            pending_games = pending_careers = 0
+                            progress['last_completed_idx'] = first_timeout_idx - 1
+                            save_progress(progress)
+                            rate_limiter.pause(TIMEOUT_RECOVERY_DELAY)
+                            time.sleep(TIMEOUT_RECOVERY_DELAY)
+                            
+                            # Reset and go back to first timeout
+                            consecutive_timeouts = 0
+                            first_timeout_idx = None
+                            print("🔄 Resuming...\n")
+                            break
+                        continue  # Next player, still counting timeouts
+                    
+                    consecutive_timeouts = 0  # Reset on success
                     first_timeout_idx = None
-                    i = progress['last_completed_idx'] + 1  # Resume from first timeout
-                    print("🔄 Resuming...\n")
-                    continue
+                    print(f"✓ {games} games" + (f", {careers} seasons" if not skip_career else ""))
+                    
+                    done_idx = idx
                 else:
-                    i += 1  # Move to next player, still counting timeouts
+                    conn.commit()
+                    total_games += pending_games
+                    total_careers += pending_careers
+                    pending_games = pending_careers = 0
+                    progress['last_completed_idx'] = done_idx
+                    save_progress(progress)
+                    i = batch_end
                     continue
-            else:
-                consecutive_timeouts = 0  # Reset on success
-                first_timeout_idx = None
-                print(f"✓ {games} games" + (f", {careers} seasons" if not skip_career else ""))
-            
-            # Save progress after each successful player
-            progress['last_completed_idx'] = i
-            save_progress(progress)
-            i += 1  # Move to next player
-            
+                
+                # Timeout recovery or a rolled-back batch broke out; resume
+                # from the last committed player
+                done_idx = progress['last_completed_idx']
+                i = done_idx + 1
+        
         except KeyboardInterrupt:
+            conn.commit()
+            progress['last_completed_idx'] = done_idx
             print("\n\n⚠️  Interrupted! Progress saved. Run again to resume.")
-            save_progress(progress)
             return
-        except Exception as e:
-            print(f"❌ Failed: {e}")
-            # Save progress and move to next player
-            progress['last_completed_idx'] = i
+        finally:
+            # Covers interrupts and crashes mid-batch too (committed work only)
             save_progress(progress)
-            i += 1
-    
-    # Complete!
-    clear_progress()
-    
-    # Update team game logs (only 30 teams, quick)
-    print(f"\n{'='*70}")
-    print(f"  UPDATING TEAM GAME LOGS")
-    print(f"{'='*70}\n")
-    
-    team_ids = get_team_ids()
-    total_team_games = 0
-    
-    for team_id in team_ids:
-        print(f"  Team {team_id}...", end=" ", flush=True)
-        games, was_timeout = fetch_team_game_logs(team_id, season_string)
-        total_team_games += games
-        if was_timeout:
-            print("⚠️  timeout")
-        else:
-            print(f"✓ {games} games")
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Complete!
+        clear_progress()
+        
+        # Update team game logs (only 30 teams, quick)
+        print(f"\n{'='*70}")
+        print(f"  UPDATING TEAM GAME LOGS")
+        print(f"{'='*70}\n")
+        
+        team_ids = get_team_ids()
+        total_team_games = 0
+        
+        with ThreadPoolExecutor(max_workers=WORKERS) as team_executor:
+            results = team_executor.map(lambda team_id: fetch_team_game_logs(team_id, season_string), team_ids)
+            for team_id, (rows, was_timeout) in zip(team_ids, results):
+                print(f"  Team {team_id}...", end=" ", flush=True)
+                try:
+                    games = write_rows(cursor, TEAM_GAME_LOG_SQL, rows)
+                    # One commit per team, so a failure (even a deadlock that
+                    # rolls back the whole transaction) only loses this team
+                    conn.commit()
+                except Exception as e:
+                    print(f"❌ Failed: {e}")
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                    continue
+                total_team_games += games
+                if was_timeout:
+                    print("⚠️  timeout")
+                else:
+                    print(f"✓ {games} games")
     
     print(f"\n{'='*70}")
     print(f"  UPDATE COMPLETE")
@@ -416,7 +500,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Incremental NBA data update")
     parser.add_argument('--skip-career', action='store_true', help='Skip career stats update')
     parser.add_argument('--no-resume', action='store_true', help='Start fresh, ignore saved progress')
+    parser.add_argument('--all-players', action='store_true', help='Update every active player, even without new games')
     
     args = parser.parse_args()
     
-    main(skip_career=args.skip_career, resume=not args.no_resume)
\ No newline at end of file
+    main(skip_career=args.skip_career, resume=not args.no_resume, all_players=args.all_players)
\ No newline at end of file